@@ -6,10 +6,10 @@ from sqlalchemy import pool
 from alembic import context
 
 # Import Base and models
-from backend.app.database import Base
+from app.database import Base
 from app.models.user import User
-from app.models.post import Post
-from backend.app.config import settings
+from app.models.post import Post, PostTombstone
+from app.config import settings
 
 # This is the Alembic Config object
 config = context.config
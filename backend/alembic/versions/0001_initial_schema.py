@@ -0,0 +1,62 @@
+"""Initial users and posts schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+Databases created by the old import-time create_all already have these
+tables, so each object is only created when it is missing.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    if "users" not in tables:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("username", sa.String(150), nullable=False),
+            sa.Column("email", sa.String(255), nullable=False),
+            sa.Column("hashed_password", sa.String(255), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_username", "users", ["username"], unique=True)
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if "posts" not in tables:
+        op.create_table(
+            "posts",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("image_url", sa.Text(), nullable=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+        op.create_index("ix_posts_id", "posts", ["id"])
+        op.create_index("ix_posts_title", "posts", ["title"])
+
+    post_indexes = {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("posts")}
+    if "ix_posts_created_at_id" not in post_indexes:
+        op.create_index("ix_posts_created_at_id", "posts", ["created_at", "id"])
+    if "ix_posts_user_id_created_at_id" not in post_indexes:
+        op.create_index("ix_posts_user_id_created_at_id", "posts", ["user_id", "created_at", "id"])
+
+
+def downgrade():
+    op.drop_table("posts")
+    op.drop_table("users")
@@ -0,0 +1,42 @@
+"""Full-text search vector on posts
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+Adds a generated, weighted tsvector over title (A) and content (B) with a
+GIN index. PostgreSQL only; other databases use the in-memory search backend.
+The text search configuration must match settings.SEARCH_LANGUAGE.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute(
+        """
+        ALTER TABLE posts ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(content, '')), 'B')
+        ) STORED
+        """
+    )
+    op.execute("CREATE INDEX ix_posts_search_vector ON posts USING gin (search_vector)")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_posts_search_vector")
+    op.execute("ALTER TABLE posts DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,35 @@
+"""Stored excerpt for post listings
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+Backfills existing rows with a whitespace-collapsed prefix of the content;
+new and edited posts get excerpts from app.services.post.make_excerpt.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+EXCERPT_LENGTH = 280
+
+
+def upgrade():
+    op.add_column("posts", sa.Column("excerpt", sa.Text(), nullable=True))
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            f"UPDATE posts SET excerpt = left(regexp_replace(regexp_replace(content, '<[^>]+>', ' ', 'g'), '\\s+', ' ', 'g'), {EXCERPT_LENGTH})"
+        )
+    else:
+        op.execute(f"UPDATE posts SET excerpt = substr(content, 1, {EXCERPT_LENGTH})")
+
+
+def downgrade():
+    op.drop_column("posts", "excerpt")
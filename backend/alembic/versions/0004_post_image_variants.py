@@ -0,0 +1,26 @@
+"""Resized image variants for posts
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+Existing posts keep image_variants empty until the derivative pipeline
+processes their image.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("posts", sa.Column("image_variants", sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("posts", "image_variants")
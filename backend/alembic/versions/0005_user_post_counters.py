@@ -0,0 +1,35 @@
+"""Per-author post counters on users
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+Backfills post_count and last_post_at from posts; afterwards they are kept
+current by the post services, and `python -m app.cli.repair_counters`
+rebuilds them if they ever drift.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("users", sa.Column("post_count", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("users", sa.Column("last_post_at", sa.DateTime(timezone=True), nullable=True))
+
+    op.execute(
+        "UPDATE users SET "
+        "post_count = (SELECT count(*) FROM posts WHERE posts.user_id = users.id), "
+        "last_post_at = (SELECT max(created_at) FROM posts WHERE posts.user_id = users.id)"
+    )
+
+
+def downgrade():
+    op.drop_column("users", "last_post_at")
+    op.drop_column("users", "post_count")
@@ -0,0 +1,37 @@
+"""Change feed: (updated_at, id) index on posts and a tombstone table for deletes
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+
+Posts deleted before this migration have no tombstone, so clients should
+start syncing from a fresh token rather than one built from older state.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_posts_updated_at_id", "posts", ["updated_at", "id"])
+
+    op.create_table(
+        "post_tombstones",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("post_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index("ix_post_tombstones_deleted_at_id", "post_tombstones", ["deleted_at", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_post_tombstones_deleted_at_id", table_name="post_tombstones")
+    op.drop_table("post_tombstones")
+    op.drop_index("ix_posts_updated_at_id", table_name="posts")
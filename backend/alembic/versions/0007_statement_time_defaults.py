@@ -0,0 +1,38 @@
+"""Change feed timestamps from the statement clock on PostgreSQL
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+
+now() is the start of the transaction, so a post written late in a long
+transaction could commit behind a change token already handed out.
+clock_timestamp() is the time of the write itself. Other databases already
+default to the statement's CURRENT_TIMESTAMP.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = (("posts", "created_at"), ("posts", "updated_at"), ("post_tombstones", "deleted_at"))
+
+
+def upgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for table, column in _COLUMNS:
+        op.alter_column(table, column, server_default=sa.text("clock_timestamp()"))
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for table, column in _COLUMNS:
+        op.alter_column(table, column, server_default=sa.func.now())
@@ -0,0 +1,66 @@
+"""Export posts as NDJSON or CSV, streamed from a server-side cursor.
+
+    python -m app.cli.export_posts > posts.ndjson
+    python -m app.cli.export_posts --format csv --username alice --output alice.csv
+    python -m app.cli.export_posts --updated-since 2026-10-01T00:00:00Z > changed.ndjson
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from app.database import SessionLocal
+from app.models.user import User
+from app.schemas.post import ExportFormat
+from app.services.post_export import ENCODERS, iter_export_rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=[fmt.value for fmt in ExportFormat], default=ExportFormat.NDJSON.value)
+    author = parser.add_mutually_exclusive_group()
+    author.add_argument("--user-id", type=int, help="Only export this author's posts")
+    author.add_argument("--username", help="Only export this author's posts")
+    parser.add_argument("--updated-since", type=datetime.fromisoformat, help="Only posts created or edited at or after this ISO 8601 time")
+    parser.add_argument("--batch-size", type=int, default=None, help="Rows fetched per round trip")
+    parser.add_argument("--output", help="File to write; defaults to stdout")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        user_id = args.user_id
+        if args.username:
+            user_id = db.query(User.id).filter(User.username == args.username).scalar()
+            if user_id is None:
+                parser.error("author not found")
+
+        out = open(args.output, "wb") if args.output else sys.stdout.buffer
+        started = time.perf_counter()
+        exported = 0
+
+        def counted(rows):
+            nonlocal exported
+            for row in rows:
+                exported += 1
+                yield row
+
+        kwargs = {"batch_size": args.batch_size} if args.batch_size else {}
+        try:
+            rows = counted(iter_export_rows(db, user_id, args.updated_since, **kwargs))
+            for chunk in ENCODERS[ExportFormat(args.format)](rows):
+                out.write(chunk)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - started
+    summary = {"exported": exported, "seconds": round(elapsed, 3), "posts_per_second": round(exported / elapsed, 1) if elapsed else 0.0}
+    # The export itself may be on stdout, so the summary goes to stderr
+    sys.stderr.write(json.dumps(summary) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""Bulk-import posts from NDJSON, one PostCreate object per line.
+
+    python -m app.cli.import_posts posts.ndjson --username alice
+    cat posts.ndjson | python -m app.cli.import_posts - --user-id 42
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from app.database import SessionLocal
+from app.models.user import User
+from app.services.post_import import import_posts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="NDJSON file, or - for stdin")
+    author = parser.add_mutually_exclusive_group(required=True)
+    author.add_argument("--user-id", type=int, help="Author of the imported posts")
+    author.add_argument("--username", help="Author of the imported posts")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Rows validated and inserted per statement")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        query = db.query(User.id)
+        query = query.filter(User.id == args.user_id) if args.user_id else query.filter(User.username == args.username)
+        user_id = query.scalar()
+        if user_id is None:
+            parser.error("author not found")
+
+        stream = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8")
+        started = time.perf_counter()
+        try:
+            # Each committed chunk also invalidates cached listings and home feeds, as over HTTP
+            result = asyncio.run(import_posts(db, stream, user_id, args.chunk_size))
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+
+    result["seconds"] = round(elapsed, 3)
+    result["posts_per_second"] = round(result["inserted"] / elapsed, 1) if elapsed else 0.0
+    json.dump(result, sys.stdout, indent=2, default=str)
+    sys.stdout.write("\n")
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
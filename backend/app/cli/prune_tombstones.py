@@ -0,0 +1,33 @@
+"""Delete change-feed tombstones older than CHANGES_TOMBSTONE_RETENTION_DAYS; run it daily.
+
+    python -m app.cli.prune_tombstones
+    python -m app.cli.prune_tombstones --retention-days 7
+"""
+import argparse
+import json
+import sys
+import time
+from app.config import settings
+from app.database import SessionLocal
+from app.services.post_changes import prune_tombstones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--retention-days", type=int, default=settings.CHANGES_TOMBSTONE_RETENTION_DAYS)
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        pruned = prune_tombstones(db, args.retention_days)
+    finally:
+        db.close()
+
+    json.dump({"pruned": pruned, "seconds": round(time.perf_counter() - started, 3)}, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""Rebuild the per-author post counters (users.post_count, users.last_post_at) from posts.
+
+    python -m app.cli.repair_counters
+    python -m app.cli.repair_counters --user-id 42
+"""
+import argparse
+import json
+import sys
+import time
+from app.database import SessionLocal
+from app.services.user import repair_post_counters
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", type=int, help="Repair a single author instead of every user")
+    parser.add_argument("--batch-size", type=int, default=1000, help="User ids updated per transaction")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        repaired = repair_post_counters(db, args.user_id, args.batch_size)
+    finally:
+        db.close()
+
+    json.dump({"repaired": repaired, "seconds": round(time.perf_counter() - started, 3)}, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
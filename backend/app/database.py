@@ -1,13 +1,126 @@
-from sqlalchemy import create_engine
+from datetime import datetime, timezone
+from typing import Union
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import DateTime, create_engine, literal
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.sql.functions import FunctionElement
 
 from app.config import settings
+from app.utils.pool_metrics import instrumented_pool_class
+from app.utils.request_metrics import install_query_hooks
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def engine_options(url: str, name: str, is_async: bool = False) -> dict:
+    """Pool and connection options from settings; SQLite keeps SQLAlchemy's own pooling"""
+    if url.startswith("sqlite"):
+        return {}
+
+    base_pool = AsyncAdaptedQueuePool if is_async else QueuePool
+    options = {
+        "poolclass": instrumented_pool_class(base_pool, name),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS and url.startswith("postgresql"):
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+install_query_hooks()
+
+_engine = None
+
+def get_engine():
+    """Build the primary engine on first use, so importing the app loads no database driver"""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL, "primary"))
+        SessionLocal.configure(bind=_engine)
+    return _engine
+
+class _PrimarySessionmaker(sessionmaker):
+    def __call__(self, **local_kw):
+        get_engine()
+        return super().__call__(**local_kw)
+
+SessionLocal = _PrimarySessionmaker(autocommit=False, autoflush=False)
 Base = declarative_base()
 
+# Either kind of session can be handed to the service layer
+DBSession = Union[Session, AsyncSession]
+
+def timestamp_bound(db: Session, value: datetime):
+    """`value` as a bound to compare timestamp columns against.
+
+    SQLite keeps timestamps as text: server defaults as 'YYYY-MM-DD HH:MM:SS',
+    while SQLAlchemy binds 'YYYY-MM-DD HH:MM:SS.ffffff', which sorts after every
+    row of the same second. There the bound is written the way such a row is
+    stored, so equal timestamps compare equal and keyset seeks stay on the index.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return value
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return literal(value.isoformat(" ", "microseconds" if value.microsecond else "seconds"))
+
+class statement_time(FunctionElement):
+    """The database clock when the statement runs, for write timestamps the change feed reads.
+
+    Postgres's now() is frozen at the start of the transaction, so a row written
+    late in a long transaction would carry a time from well before its commit.
+    """
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+@compiles(statement_time)
+def _statement_time(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+@compiles(statement_time, "postgresql")
+def _statement_time_postgresql(element, compiler, **kw):
+    return "clock_timestamp()"
+
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+_async_engine = None
+_AsyncSessionLocal = None
+
+def async_url(url: str) -> str:
+    """The same database URL with its driver swapped for the async one"""
+    scheme, _, rest = url.partition("://")
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+def get_async_database_url() -> str:
+    """Async driver URL: DATABASE_ASYNC_URL if set, otherwise DATABASE_URL with its driver swapped"""
+    return settings.DATABASE_ASYNC_URL or async_url(settings.DATABASE_URL)
+
+def get_async_engine():
+    """Build the async engine on first use, so sync deployments never need an async driver"""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        url = get_async_database_url()
+        _async_engine = create_async_engine(url, **engine_options(url, "primary_async", is_async=True))
+        # Objects stay usable after commit without an implicit (blocking) refresh
+        _AsyncSessionLocal = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+def get_async_sessionmaker():
+    get_async_engine()
+    return _AsyncSessionLocal
+
 # Dependency to get DB session
 def get_db():
     db = SessionLocal()
@@ -15,3 +128,39 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency to get an async DB session
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+# Session dependency for the configured DB_MODE
+get_session = get_async_db if settings.DB_MODE == "async" else get_db
+
+async def run_db(db: DBSession, fn, *args, **kwargs):
+    """Run a synchronous service function against either kind of session.
+
+    Async sessions run it through `run_sync`, so its queries go over the async
+    driver without blocking the event loop; sync sessions run it in the threadpool.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+async def run_on_primary(fn, *args, **kwargs):
+    """Like `run_db`, on a session of its own on the primary, whatever the request reads from"""
+    if settings.DB_MODE == "async":
+        async with get_async_sessionmaker()() as db:
+            return await run_db(db, fn, *args, **kwargs)
+    db = SessionLocal()
+    try:
+        return await run_db(db, fn, *args, **kwargs)
+    finally:
+        db.close()
+
+async def dispose_engines():
+    """Close pooled connections on shutdown"""
+    if _engine is not None:
+        _engine.dispose()
+    if _async_engine is not None:
+        await _async_engine.dispose()
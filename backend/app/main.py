@@ -1,19 +1,49 @@
+import os
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import auth, upload, post
-from app.database import engine, Base
+from fastapi.staticfiles import StaticFiles
+from app.routes import auth, upload, post, metrics, user
+from app.database import Base, dispose_engines, get_engine
+from app.config import settings
+from app.middleware.admission import ConcurrencyLimitMiddleware, RateLimitMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.timing import RequestTimingMiddleware
+from app.services.images import derivative_pipeline
+from app.utils.hashing import hashing_pool
+from app.utils.replicas import replica_set
 
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema is managed by Alembic; create_all is only a convenience for throwaway databases
+    if settings.DB_CREATE_ALL:
+        await run_in_threadpool(Base.metadata.create_all, bind=get_engine())
+    if settings.STORAGE_BACKEND == "local":
+        os.makedirs(settings.LOCAL_STORAGE_DIR, exist_ok=True)
+    derivative_pipeline.start()
+    replica_set.start()
+    yield
+    hashing_pool.shutdown()
+    derivative_pipeline.shutdown()
+    await replica_set.shutdown()
+    await dispose_engines()
 
 app = FastAPI(
     title="Blogi API",
     description="API for a blogging platform",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Admission control sits inside CORS, so 429 and 503 responses stay readable by
+# browsers; abusive clients are turned away before they take a concurrency slot
+app.add_middleware(ConcurrencyLimitMiddleware)
+app.add_middleware(RateLimitMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -21,12 +51,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "Retry-After"],
 )
 
+app.add_middleware(CompressionMiddleware)
+
+# Outermost, so timings cover compression, CORS handling and every route
+app.add_middleware(RequestTimingMiddleware)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(post.router)
 app.include_router(upload.router)
+app.include_router(user.router)
+app.include_router(metrics.router)
+app.include_router(metrics.prometheus_router)
+
+# Serve uploads from disk when they are not in S3 (nginx can take this over in production)
+if settings.STORAGE_BACKEND == "local":
+    app.mount(
+        urlparse(settings.LOCAL_STORAGE_URL).path,
+        StaticFiles(directory=settings.LOCAL_STORAGE_DIR, check_dir=False),
+        name="media"
+    )
 
 # Global exception handler
 @app.exception_handler(Exception)
@@ -0,0 +1,117 @@
+import asyncio
+import math
+from typing import Optional
+from urllib.parse import parse_qsl
+from fastapi.responses import JSONResponse
+from app.config import settings
+from app.services.rate_limit import get_rate_limiter, request_cost
+from app.utils.request_metrics import REQUESTS_REJECTED
+
+# Scrapes, docs and static files are never limited, so they keep working under load
+_EXEMPT_PREFIXES = ("/metrics", "/api/metrics/", "/docs", "/openapi.json", "/media/")
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def client_ip(scope) -> str:
+    """The client address, taken from X-Forwarded-For only as far as TRUSTED_PROXY_HOPS allows"""
+    hops = settings.TRUSTED_PROXY_HOPS
+    if hops > 0:
+        forwarded = [address.strip() for address in (_header(scope, b"x-forwarded-for") or "").split(",") if address.strip()]
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _user_id(scope) -> Optional[int]:
+    scheme, _, token = (_header(scope, b"authorization") or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    from jose import JWTError, jwt
+    try:
+        # Verified, so a forged token cannot mint fresh buckets
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]).get("id")
+    except JWTError:
+        return None
+
+
+async def _reject(scope, receive, send, status_code: int, detail: str, retry_after: float) -> None:
+    response = JSONResponse(
+        status_code=status_code,
+        content={"detail": detail},
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+    )
+    await response(scope, receive, send)
+
+
+class RateLimitMiddleware:
+    """Token-bucket rate limiting per user (authenticated) or per client IP (anonymous).
+
+    Each request takes `request_cost` tokens, so searches, logins and imports
+    drain a bucket faster than plain reads. Over the limit: 429 with Retry-After.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or settings.RATE_LIMIT_BACKEND == "none"
+            or scope["path"].startswith(_EXEMPT_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        user_id = _user_id(scope)
+        if user_id is not None:
+            key, rate, burst = f"user:{user_id}", settings.RATE_LIMIT_USER_RATE, settings.RATE_LIMIT_USER_BURST
+        else:
+            key, rate, burst = f"ip:{client_ip(scope)}", settings.RATE_LIMIT_IP_RATE, settings.RATE_LIMIT_IP_BURST
+        params = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+        cost = min(request_cost(scope["method"], scope["path"], params), burst)
+
+        wait = await get_rate_limiter().take(key, cost, rate, burst)
+        if wait:
+            REQUESTS_REJECTED.inc(("rate_limited",))
+            await _reject(scope, receive, send, 429, "Too many requests", wait)
+            return
+        await self.app(scope, receive, send)
+
+
+class ConcurrencyLimitMiddleware:
+    """Caps the requests this worker handles at once at MAX_CONCURRENT_REQUESTS.
+
+    A request that finds every slot taken waits up to ADMISSION_WAIT_SECONDS and
+    is then shed with 503 and Retry-After, rather than queueing on the
+    database pool until it times out.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._slots = asyncio.Semaphore(settings.MAX_CONCURRENT_REQUESTS) if settings.MAX_CONCURRENT_REQUESTS > 0 else None
+
+    async def __call__(self, scope, receive, send):
+        if self._slots is None or scope["type"] != "http" or scope["path"].startswith(_EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        if self._slots.locked():
+            try:
+                await asyncio.wait_for(self._slots.acquire(), settings.ADMISSION_WAIT_SECONDS)
+            except asyncio.TimeoutError:
+                REQUESTS_REJECTED.inc(("overloaded",))
+                await _reject(scope, receive, send, 503, "Server is busy, please retry shortly", 1)
+                return
+        else:
+            await self._slots.acquire()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._slots.release()
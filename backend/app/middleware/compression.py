@@ -0,0 +1,171 @@
+import zlib
+from typing import List, Optional, Tuple
+from app.config import settings
+
+_COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+class _GzipEncoder:
+
+    def __init__(self):
+        # wbits=31: gzip container rather than a raw zlib stream
+        self._compressor = zlib.compressobj(settings.GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _BrotliEncoder:
+
+    def __init__(self):
+        import brotli
+
+        self._compressor = brotli.Compressor(quality=settings.BROTLI_QUALITY)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._compressor.process(data)
+        return out + (self._compressor.finish() if final else self._compressor.flush())
+
+
+class _ZstdEncoder:
+
+    def __init__(self):
+        import zstandard
+
+        self._compressor = zstandard.ZstdCompressor(level=settings.ZSTD_LEVEL).compressobj()
+        self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._compressor.compress(data)
+        return out + (self._compressor.flush() if final else self._compressor.flush(self._flush_block))
+
+
+def _available(name: str) -> bool:
+    module = {"br": "brotli", "zstd": "zstandard"}.get(name)
+    if module is None:
+        return name == "gzip"
+    try:
+        __import__(module)
+        return True
+    except ImportError:
+        return False
+
+
+_ENCODERS = {"gzip": _GzipEncoder, "br": _BrotliEncoder, "zstd": _ZstdEncoder}
+_supported: Optional[List[str]] = None
+
+
+def supported_encodings() -> List[str]:
+    """Configured encodings whose libraries are installed, in server preference order"""
+    global _supported
+    if _supported is None:
+        configured = [name.strip() for name in settings.COMPRESSION_ENCODINGS.split(",") if name.strip()]
+        _supported = [name for name in configured if name in _ENCODERS and _available(name)]
+    return _supported
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Pick the preferred supported encoding the client accepts (q > 0), or None for identity"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    wildcard = accepted.get("*", 0.0)
+    candidates = [
+        (accepted.get(name, wildcard), -index, name) for index, name in enumerate(supported_encodings())
+    ]
+    best = max(candidates, default=None)
+    return best[2] if best and best[0] > 0 else None
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+class CompressionMiddleware:
+    """Compresses JSON and text responses above COMPRESSION_MIN_BYTES with gzip, brotli or zstd.
+
+    Small responses go out as is. Streamed bodies are compressed chunk by chunk
+    and flushed, so clients still see progress. A compressed representation
+    gets a weak ETag, since the strong one identifies the identity bytes.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or settings.COMPRESSION_MIN_BYTES < 0:
+            await self.app(scope, receive, send)
+            return
+
+        accept = _header(scope["headers"], b"accept-encoding")
+        encoding = negotiate(accept.decode("latin-1")) if accept else None
+        # Held back until the first body chunk shows whether compression is worth it
+        pending_start = None
+        encoder = None
+
+        async def send_compressed(message):
+            nonlocal pending_start, encoder
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                content_type = (_header(headers, b"content-type") or b"").decode("latin-1")
+                if not content_type.startswith(_COMPRESSIBLE_TYPES) or _header(headers, b"content-encoding"):
+                    await send(message)
+                    return
+                vary = _header(headers, b"vary")
+                headers = [(key, value) for key, value in headers if key.lower() != b"vary"]
+                headers.append((b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding"))
+                message = {**message, "headers": headers}
+                if encoding is None or message["status"] in (204, 304):
+                    await send(message)
+                else:
+                    pending_start = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is not None:
+                await send({**message, "body": encoder.compress(body, final=not more_body)})
+                return
+            if pending_start is None:
+                await send(message)
+                return
+
+            start, pending_start = pending_start, None
+            if not more_body and len(body) < settings.COMPRESSION_MIN_BYTES:
+                await send(start)
+                await send(message)
+                return
+
+            encoder = _ENCODERS[encoding]()
+            compressed = encoder.compress(body, final=not more_body)
+            headers = []
+            for key, value in start["headers"]:
+                name = key.lower()
+                if name == b"content-length":
+                    continue
+                if name == b"etag" and not value.startswith(b"W/"):
+                    value = b"W/" + value
+                headers.append((key, value))
+            headers.append((b"content-encoding", encoding.encode()))
+            if not more_body:
+                headers.append((b"content-length", str(len(compressed)).encode()))
+            await send({**start, "headers": headers})
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
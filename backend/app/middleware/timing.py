@@ -0,0 +1,39 @@
+from app.config import settings
+from app.utils.request_metrics import end_request, observe_request, server_timing_header, start_request
+
+
+class RequestTimingMiddleware:
+    """Times each HTTP request, reports it in a Server-Timing header and records per-route histograms.
+
+    A plain ASGI middleware rather than BaseHTTPMiddleware, so the timings
+    contextvar is visible to dependencies, threadpool work and streamed bodies.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings, token = start_request()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.SERVER_TIMING:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", server_timing_header(timings).encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            end_request(token)
+            # The router stores the matched route in the scope; label by its template, not the raw path
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            observe_request(scope["method"], route, status_code, timings, timings.elapsed)
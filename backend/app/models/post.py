@@ -1,7 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, JSON
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
-from app.database import Base
+from app.database import Base, statement_time
 
 class Post(Base):
     __tablename__ = "posts"
@@ -9,12 +8,39 @@ class Post(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False, index=True)  
     content = Column(Text, nullable=False)             
+    excerpt = Column(Text, nullable=True)
     image_url = Column(Text, nullable=True) 
+    # Resized copies of image_url, filled in by the derivative pipeline
+    image_variants = Column(JSON, nullable=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Statement time, not transaction start: the change feed reads posts by updated_at
+    created_at = Column(DateTime(timezone=True), server_default=statement_time())
+    updated_at = Column(DateTime(timezone=True), server_default=statement_time(), onupdate=statement_time())
     
     # Relationship to the user who created the post
     author = relationship("User", back_populates="posts")
 
+    # Composite indexes backing keyset pagination on (created_at, id)
+    __table_args__ = (
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        Index("ix_posts_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Backs the change feed, which reads posts in (updated_at, id) order
+        Index("ix_posts_updated_at_id", "updated_at", "id"),
+    )
+
+
+class PostTombstone(Base):
+    """Record of a deleted post, so the change feed can report the delete"""
+    __tablename__ = "post_tombstones"
+
+    id = Column(Integer, primary_key=True)
+    # Not a foreign key: the post row is gone
+    post_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=statement_time(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_post_tombstones_deleted_at_id", "deleted_at", "id"),
+    )
+
 
@@ -12,6 +12,9 @@ class User(Base):
     hashed_password = Column(String(255), nullable=False)  
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Denormalized author stats, kept in step with posts by app.services.user
+    post_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_post_at = Column(DateTime(timezone=True), nullable=True)
 
     posts = relationship("Post", back_populates="author", cascade="all, delete-orphan")
 
@@ -1,17 +1,16 @@
 from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
 from app.schemas.user import UserCreate, UserLogin, UserResponse
 from app.schemas.auth import Token
-from app.services.auth import create_user, authenticate_user
-from app.database import get_db
+from app.services.auth import create_user_async, authenticate_user_async
+from app.database import DBSession, get_session
 
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    return create_user(db, user)
+async def register(user: UserCreate, db: DBSession = Depends(get_session)):
+    return await create_user_async(db, user)
 
 @router.post("/login", response_model=Token)
-def login(user_login: UserLogin, db: Session = Depends(get_db)):
-    return authenticate_user(db, user_login)
+async def login(user_login: UserLogin, db: DBSession = Depends(get_session)):
+    return await authenticate_user_async(db, user_login)
@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.schemas.metrics import PoolStatsList, ReplicaStatusList
+from app.utils.pool_metrics import pool_stats
+from app.utils.replicas import replica_set
+from app.utils.request_metrics import render_prometheus
+
+router = APIRouter(prefix="/api/metrics", tags=["Metrics"])
+
+# Scraped by Prometheus at the conventional path, outside the /api prefix
+prometheus_router = APIRouter(tags=["Metrics"])
+
+@router.get("/pool", response_model=PoolStatsList)
+def get_pool_stats():
+    return {"pools": pool_stats()}
+
+@router.get("/replicas", response_model=ReplicaStatusList)
+def get_replica_status():
+    return {"replicas": replica_set.status()}
+
+@prometheus_router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_prometheus_metrics():
+    return PlainTextResponse(render_prometheus(pool_stats()), media_type="text/plain; version=0.0.4")
@@ -1,85 +1,216 @@
-from fastapi import APIRouter, Depends, Query, status, HTTPException
-from sqlalchemy.orm import Session
-from typing import Optional
-from app.models.user import User
-from app.database import get_db
+from fastapi import APIRouter, Depends, Query, Request, Response, status, HTTPException
+from datetime import datetime
+from typing import Optional, Tuple
+from fastapi.responses import StreamingResponse
+from app.schemas.auth import UserPrincipal
+from app.database import DBSession, get_session
 from app.utils.auth import get_current_user
-from app.schemas.post import PostList, PostCreate, PostResponse, PostUpdate
-from app.services.post import create_blog_post, get_blog_post, get_blog_posts, update_blog_post, delete_blog_post, get_user_posts
+from app.schemas.post import PostList, PostCreate, PostResponse, PostUpdate, CountMode, PostFields, BulkImportResult, ExportFormat, PostChanges
+from app.services.post import (
+    create_blog_post_async, get_blog_post_async, get_blog_posts_async,
+    update_blog_post_async, delete_blog_post_async, get_user_posts_async
+)
+from app.services.post_import import import_posts_stream_async
+from app.services.post_export import MEDIA_TYPES, export_posts
+from app.services.post_changes import get_post_changes_async
+from app.services.response_cache import CachedResponse, get_response_cache, listing_cache_key, post_cache_key
+from app.utils.replicas import get_read_session, read_from_replica, wrote_recently
+from app.utils.http_cache import conditional_json_response, http_date, is_not_modified, latest, not_modified_response, validator_etag
+from app.utils.request_metrics import timed
+from app.utils.serialization import dump_json
 from app.config import settings
 
 router = APIRouter(prefix="/api/blogs", tags=["Blog Posts"])
 
 @router.post("/", response_model=PostResponse, status_code=status.HTTP_201_CREATED)
-def create_post(
+async def create_post(
     blog_post: PostCreate, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DBSession = Depends(get_session),
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
-    return create_blog_post(db, blog_post, current_user)
+    return await create_blog_post_async(db, blog_post, current_user)
+
+@router.post("/bulk", response_model=BulkImportResult)
+async def bulk_import_posts(
+    request: Request,
+    db: DBSession = Depends(get_session),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+    """Create many posts from an NDJSON body (one PostCreate object per line)"""
+    content_length = request.headers.get("content-length")
+    return await import_posts_stream_async(
+        db,
+        request.stream(),
+        current_user.id,
+        int(content_length) if content_length and content_length.isdigit() else None
+    )
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_all_posts(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format", description="ndjson (one post per line) or csv"),
+    author_id: Optional[int] = Query(None, description="Only export this author's posts"),
+    updated_since: Optional[datetime] = Query(None, description="Only export posts created or edited at or after this time, for incremental exports"),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+    """Stream every matching post in id order; memory use does not grow with the number of posts"""
+    return StreamingResponse(
+        export_posts(export_format, author_id, updated_since),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="posts.{export_format.value}"'}
+    )
+
+@router.get("/changes", response_model=PostChanges)
+async def get_changes(
+    response: Response,
+    # The primary, not a replica: a lagging replica could hide changes behind a token
+    db: DBSession = Depends(get_session),
+    since: Optional[str] = Query(None, description="Token from a previous response's next; omit to start from the beginning"),
+    limit: int = Query(settings.CHANGES_BATCH_SIZE, ge=1, le=settings.CHANGES_MAX_BATCH_SIZE, description="Most changes to return"),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+    """Posts created, edited or deleted since a token, for incremental sync"""
+    response.headers["Cache-Control"] = "private, no-store"
+    return await get_post_changes_async(db, since, limit)
+
+# Bump when the JSON shape of posts changes, so validators from older builds stop matching
+_REPRESENTATION_VERSION = 1
+
+# Everything a post's JSON is rendered from; which of content and excerpt is present tells the shapes apart
+_RENDERED_FIELDS = ("title", "content", "excerpt", "image_url", "image_srcset", "author_username", "created_at", "updated_at")
+
+def _item_state(item) -> tuple:
+    return (item["id"], "content" in item) + tuple(str(item.get(field)) for field in _RENDERED_FIELDS)
+
+def _validators(model, data) -> Tuple[str, Optional[str]]:
+    """Strong ETag and Last-Modified derived from the post fields a body is rendered from, without serializing.
+
+    updated_at has one-second resolution, so two edits within a second share it;
+    the ETag covers the rendered fields themselves. Listings get no Last-Modified:
+    the newest updated_at on a page does not move when a post is deleted or the
+    page shifts, so If-Modified-Since alone would answer 304 for a page that
+    changed. Their ETag also covers paging and totals.
+    """
+    if model is PostList:
+        items = data["items"]
+        modified = None
+        etag = validator_etag(
+            _REPRESENTATION_VERSION, "list", data["total"], data["page"], data["size"], data["pages"],
+            data["next_cursor"], str(data["count_mode"]),
+            tuple(_item_state(item) for item in items)
+        )
+    else:
+        modified = latest([data["updated_at"]])
+        etag = validator_etag(_REPRESENTATION_VERSION, "post", _item_state(data))
+    return etag, http_date(modified)
+
+def _render(model, data, etag: str, last_modified: Optional[str]) -> CachedResponse:
+    """Serialize a response once, with the validators used for caching and 304s"""
+    with timed("serialize"):
+        body = dump_json(model, data)
+    return CachedResponse(body, etag, last_modified)
+
+async def _conditional_response(
+    request: Request, model, data, cache_control: str, cache_key: Optional[str] = None
+) -> Response:
+    """Answer from validators alone when the client's copy is current; otherwise serialize (and cache)"""
+    etag, last_modified = _validators(model, data)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified, cache_control)
+    rendered = _render(model, data, etag, last_modified)
+    if cache_key is not None and await _shareable(request):
+        await get_response_cache().set(cache_key, rendered)
+    return conditional_json_response(request, rendered.body, etag, last_modified, cache_control)
+
+async def _shareable(request: Request) -> bool:
+    # A replica may still lack the latest change for READ_YOUR_WRITES_SECONDS after
+    # it; a page rendered there meanwhile would be cached under the new generation
+    if not read_from_replica(request):
+        return True
+    return await get_response_cache().seconds_since_bump() > settings.READ_YOUR_WRITES_SECONDS
+
+async def _cached(request: Request, key: str) -> Optional[CachedResponse]:
+    # A cached copy may have been rendered from a replica that had not yet seen
+    # this user's own write, so recent writers skip it along with the replicas
+    if wrote_recently(request):
+        return None
+    return await get_response_cache().get(key)
 
 @router.get("/{post_id}", response_model=PostResponse)
-def get_post(post_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    post = get_blog_post(db, post_id, current_user)
+async def get_post(
+    post_id: int,
+    request: Request,
+    db: DBSession = Depends(get_read_session),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+    # Authenticated endpoint: shared proxies must not store it
+    cache_control = "private, no-cache"
+    key = await post_cache_key(post_id)
+    cached = await _cached(request, key)
+    if cached is not None:
+        return conditional_json_response(request, cached.body, cached.etag, cached.last_modified, cache_control)
+
+    post = await get_blog_post_async(db, post_id, current_user)
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Blog post not found"
         )
-    return post
+    return await _conditional_response(request, PostResponse, post, cache_control, key)
 
 @router.get("/", response_model=PostList)
-def get_posts(
-    db: Session = Depends(get_db),
+async def get_posts(
+    request: Request,
+    db: DBSession = Depends(get_read_session),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE, description="Items per page"),
-    search: Optional[str] = Query(None, description="Search term for title or content")
+    search: Optional[str] = Query(None, description="Search term for title or content"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor; overrides page"),
+    count: CountMode = Query(CountMode.EXACT, description="How to compute total/pages: exact, estimated or none"),
+    fields: PostFields = Query(PostFields.SUMMARY, description="Item shape: summary (excerpt only) or full (with content)")
 ):
+    cache_control = f"public, max-age={settings.RESPONSE_CACHE_MAX_AGE}, must-revalidate"
+    key = await listing_cache_key(
+        page=None if cursor else page, cursor=cursor, size=size, search=search, count=count.value, fields=fields.value
+    )
+    cached = await _cached(request, key)
+    if cached is not None:
+        return conditional_json_response(request, cached.body, cached.etag, cached.last_modified, cache_control)
+
     skip = (page - 1) * size
-    posts, total, current_page, limit, pages = get_blog_posts(db, skip, size, search)
-    
-    return {
-        "items": posts,
-        "total": total,
-        "page": current_page,
-        "size": limit,
-        "pages": pages
-    }
+    posts = await get_blog_posts_async(db, skip, size, search, cursor, count, fields)
+    return await _conditional_response(request, PostList, posts, cache_control, key)
 
 @router.put("/{post_id}", response_model=PostResponse)
-def update_post(
+async def update_post(
     post_id: int,
     request: PostUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DBSession = Depends(get_session),
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
-    return update_blog_post(db, post_id, request, current_user)
+    return await update_blog_post_async(db, post_id, request, current_user)
 
 @router.delete("/{post_id}", status_code=status.HTTP_200_OK)
-def delete_post(
+async def delete_post(
     post_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DBSession = Depends(get_session),
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
-    return delete_blog_post(db, post_id, current_user)
+    return await delete_blog_post_async(db, post_id, current_user)
 
 # Fixed route placement to avoid conflicts with {post_id} route
 @router.get("/user/{user_id}", response_model=PostList)
-def get_posts_by_user(
+async def get_posts_by_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    db: DBSession = Depends(get_read_session),
+    current_user: UserPrincipal = Depends(get_current_user),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE, description="Items per page"),
-    search: Optional[str] = Query(None, description="Search term for title or content")
+    search: Optional[str] = Query(None, description="Search term for title or content"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor; overrides page"),
+    count: CountMode = Query(CountMode.EXACT, description="How to compute total/pages: exact, estimated or none"),
+    fields: PostFields = Query(PostFields.SUMMARY, description="Item shape: summary (excerpt only) or full (with content)")
 ):
     skip = (page - 1) * size
-    posts, total, current_page, limit, pages = get_user_posts(db, current_user.id, skip, size, search)
-    
-    return {
-        "items": posts,
-        "total": total,
-        "page": current_page,
-        "size": limit,
-        "pages": pages
-    }
\ No newline at end of file
+    posts = await get_user_posts_async(db, user_id, skip, size, search, cursor, count, fields)
+    return await _conditional_response(request, PostList, posts, "private, no-cache")
\ No newline at end of file
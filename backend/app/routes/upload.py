@@ -1,14 +1,50 @@
-from fastapi import APIRouter, Depends
-from app.models.user import User
+from fastapi import APIRouter, Depends, Request, status
+from app.schemas.auth import UserPrincipal
 from app.utils.auth import get_current_user
-from app.schemas.upload import PresignedUrlRequest, PresignedUrlResponse
-from app.services.upload import generate_presigned_upload_url
+from app.schemas.upload import (
+    PresignedUrlRequest, PresignedUrlResponse, PresignedUrlBatchRequest, PresignedUrlBatchResponse,
+    UploadCompleteRequest, UploadCompleteResponse, StreamUploadResponse
+)
+from app.services.upload import (
+    generate_presigned_upload_url, generate_presigned_upload_urls, complete_upload, stream_upload_async
+)
 
 router = APIRouter(prefix="/api/uploads", tags=["File Uploads"])
 
 @router.post("/presigned-url", response_model=PresignedUrlResponse)
 def get_presigned_url(
     request: PresignedUrlRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
-    return generate_presigned_upload_url(request)
\ No newline at end of file
+    return generate_presigned_upload_url(request)
+
+@router.post("/presigned-urls", response_model=PresignedUrlBatchResponse)
+def get_presigned_urls(
+    request: PresignedUrlBatchRequest,
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+    return {"items": generate_presigned_upload_urls(request.files)}
+
+
+@router.post("/complete", response_model=UploadCompleteResponse, status_code=status.HTTP_202_ACCEPTED)
+def upload_complete(
+    request: UploadCompleteRequest,
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+    return complete_upload(request.file_url)
+
+
+@router.post("/stream", response_model=StreamUploadResponse, status_code=status.HTTP_201_CREATED)
+async def stream_upload(
+    request: Request,
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+    """
+    Upload an image as the raw request body, for deployments without presigned S3.
+    The body is written to storage in chunks as it arrives.
+    """
+    content_length = request.headers.get("content-length")
+    return await stream_upload_async(
+        request.stream(),
+        int(content_length) if content_length and content_length.isdigit() else None
+    )
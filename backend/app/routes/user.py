@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Depends
+from app.database import DBSession
+from app.schemas.user import UserStats
+from app.services.user import get_user_stats_async
+from app.utils.replicas import get_read_session
+
+router = APIRouter(prefix="/api/users", tags=["Users"])
+
+@router.get("/{user_id}", response_model=UserStats)
+async def get_user(user_id: int, db: DBSession = Depends(get_read_session)):
+    return await get_user_stats_async(db, user_id)
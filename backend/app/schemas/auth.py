@@ -7,4 +7,12 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     username: Optional[str] = Field(None, description="Username from the token")
-    user_id: Optional[int] = Field(None, description="User ID from the token")
\ No newline at end of file
+    user_id: Optional[int] = Field(None, description="User ID from the token")
+
+class UserPrincipal(BaseModel):
+    """Authenticated user as seen by route handlers; built without loading the full User row"""
+    id: int = Field(..., description="User ID")
+    username: str = Field(..., description="Username")
+
+    class Config:
+        from_attributes = True
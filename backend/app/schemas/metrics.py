@@ -0,0 +1,29 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+class PoolStats(BaseModel):
+    """Connection pool gauges and counters for one engine"""
+    name: str = Field(..., description="Engine name")
+    pool_size: int = Field(..., description="Configured persistent connections")
+    max_overflow: int = Field(..., description="Configured extra connections allowed under load")
+    max_connections: int = Field(..., description="Upper bound of connections this worker can open")
+    checked_out: int = Field(..., description="Connections currently in use")
+    checked_in: int = Field(..., description="Idle connections in the pool")
+    overflow: int = Field(..., description="Overflow connections currently open")
+    checkouts_total: int = Field(..., description="Connections handed out since start")
+    overflow_checkouts_total: int = Field(..., description="Checkouts served while overflow connections were open")
+    checkout_timeouts_total: int = Field(..., description="Checkouts that gave up after DB_POOL_TIMEOUT")
+    wait_seconds_total: float = Field(..., description="Total time spent obtaining connections")
+    wait_seconds_max: float = Field(..., description="Longest single wait for a connection")
+    wait_seconds_avg: float = Field(..., description="Average wait for a connection")
+
+class PoolStatsList(BaseModel):
+    pools: List[PoolStats] = Field(..., description="One entry per instrumented engine")
+
+class ReplicaStatus(BaseModel):
+    name: str = Field(..., description="Replica name, as used in pool metrics")
+    healthy: bool = Field(..., description="Whether reads are currently routed to this replica")
+    lag_seconds: Optional[float] = Field(None, description="Replication lag at the last health check (PostgreSQL only)")
+
+class ReplicaStatusList(BaseModel):
+    replicas: List[ReplicaStatus] = Field(..., description="One entry per configured read replica")
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, field_validator, Field
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Union, Dict
 from enum import Enum
 from app.schemas.error import ErrorDetail
 
@@ -11,6 +11,22 @@ class ErrorCode(str, Enum):
     NOT_FOUND = "not_found"
     PERMISSION_DENIED = "permission_denied"
 
+class CountMode(str, Enum):
+    """How listing totals are computed"""
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+class PostFields(str, Enum):
+    """Shape of the items returned by listings"""
+    SUMMARY = "summary"
+    FULL = "full"
+
+class ExportFormat(str, Enum):
+    """Encoding of a post export"""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
 class PostBase(BaseModel):
     title: str = Field(..., description="Blog post title")
     content: str = Field(..., description="Blog post content")
@@ -96,7 +112,23 @@ class PostUpdate(PostBase):
         populate_by_name = True
 
 class PostResponse(PostBase):
+    image_srcset: Optional[Dict[str, str]] = Field(None, description="srcset of resized images keyed by MIME type, once generated")
+    id: int
+    user_id: int
+    author_username: str
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class PostSummary(BaseModel):
+    """Listing representation of a post, with an excerpt instead of the full content"""
     id: int
+    title: str
+    excerpt: Optional[str] = Field(None, description="Plain-text excerpt of the post content")
+    image_url: Optional[str] = Field(None, description="URL to the post image")
+    image_srcset: Optional[Dict[str, str]] = Field(None, description="srcset of resized images keyed by MIME type, once generated")
     user_id: int
     author_username: str
     created_at: datetime
@@ -106,11 +138,37 @@ class PostResponse(PostBase):
         from_attributes = True
 
 class PostList(BaseModel):
-    total: int = Field(..., description="Total number of posts")
+    total: Optional[int] = Field(..., description="Total number of posts, or null when not counted")
     page: int = Field(..., description="Current page number")
     size: int = Field(..., description="Number of items per page")
-    items: List[PostResponse] = Field(..., description="List of posts")
-    pages: int = Field(..., description="Total number of pages")
+    items: List[Union[PostResponse, PostSummary]] = Field(..., description="List of posts, in the requested shape")
+    pages: Optional[int] = Field(..., description="Total number of pages, or null when not counted")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if there is one")
+    count_mode: CountMode = Field(CountMode.EXACT, description="Whether total/pages are exact, estimated or not counted")
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class PostChange(BaseModel):
+    """One entry of the change feed: a post created or edited, or a post deleted"""
+    id: int = Field(..., description="Post id")
+    deleted: bool = Field(..., description="Whether the post was deleted")
+    changed_at: datetime = Field(..., description="updated_at of the post, or when it was deleted")
+    post: Optional[PostResponse] = Field(None, description="Current post, unless deleted")
+
+class PostChanges(BaseModel):
+    items: List[PostChange] = Field(..., description="Changes in the order they were made; apply them in turn")
+    next: str = Field(..., description="Token to pass as `since` for the changes after these")
+    has_more: bool = Field(..., description="Whether more changes are ready; if so, fetch again right away")
+
+class BulkImportRowError(BaseModel):
+    """Errors for one rejected NDJSON line"""
+    line: int = Field(..., description="1-based line number in the uploaded stream")
+    errors: List[ErrorDetail] = Field(..., description="Why the line was rejected")
+
+class BulkImportResult(BaseModel):
+    received: int = Field(..., description="Non-empty lines received")
+    inserted: int = Field(..., description="Posts created")
+    failed: int = Field(..., description="Lines rejected")
+    errors: List[BulkImportRowError] = Field(..., description="Per-line errors, capped at BULK_IMPORT_MAX_ERRORS")
+    errors_truncated: bool = Field(False, description="Whether more lines failed than are listed")
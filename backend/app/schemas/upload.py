@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field
 from enum import Enum
+from typing import List
+from app.config import settings
 
 class FileType(str, Enum):
     JPEG = "image/jpeg"
@@ -13,4 +15,26 @@ class PresignedUrlRequest(BaseModel):
 
 class PresignedUrlResponse(BaseModel):
     upload_url: str = Field(..., description="URL to upload the file to")
-    file_url: str = Field(..., description="URL where the file will be accessible")
\ No newline at end of file
+    file_url: str = Field(..., description="URL where the file will be accessible")
+
+class PresignedUrlBatchRequest(BaseModel):
+    files: List[PresignedUrlRequest] = Field(
+        ..., min_length=1, max_length=settings.PRESIGNED_URL_BATCH_MAX, description="Files to upload"
+    )
+
+class PresignedUrlBatchResponse(BaseModel):
+    items: List[PresignedUrlResponse] = Field(..., description="One upload URL per requested file, in request order")
+
+class UploadCompleteRequest(BaseModel):
+    file_url: str = Field(..., description="file_url returned with the presigned URL, once the upload has finished")
+
+class UploadCompleteResponse(BaseModel):
+    file_url: str = Field(..., description="URL of the uploaded file")
+    queued: bool = Field(..., description="Whether resized variants are being generated")
+
+class StreamUploadResponse(BaseModel):
+    file_url: str = Field(..., description="URL where the file is accessible")
+    content_type: str = Field(..., description="MIME type detected from the file contents")
+    size: int = Field(..., description="Size of the file in bytes")
+    sha256: str = Field(..., description="Hex SHA-256 digest of the file")
+    queued: bool = Field(..., description="Whether resized variants are being generated")
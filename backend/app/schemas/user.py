@@ -19,3 +19,10 @@ class UserResponse(UserBase):
     
     class Config:
         from_attributes = True
+
+class UserStats(BaseModel):
+    id: int
+    username: str
+    created_at: datetime
+    post_count: int = Field(..., description="Number of posts the user has published")
+    last_post_at: Optional[datetime] = Field(None, description="When the user last published a post")
@@ -1,12 +1,14 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from app.database import DBSession, run_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin
-from app.utils.auth import get_password_hash, verify_password, create_access_token
+from app.utils.auth import create_access_token, get_password_hash_async, verify_password_async
+from app.utils.hashing import check_password, hash_password
 from datetime import timedelta
 from app.config import settings
 
-def create_user(db: Session, user: UserCreate):
+def _check_user_available(db: Session, user: UserCreate):
     # Check if username exists
     db_user_by_username = db.query(User).filter(User.username == user.username).first()
     if db_user_by_username:
@@ -23,41 +25,70 @@ def create_user(db: Session, user: UserCreate):
             detail="Email already registered"
         )
 
-    # Create new user
-    hashed_password = get_password_hash(user.password)
+def _insert_user(db: Session, user: UserCreate, hashed_password: str):
     db_user = User(
         username=user.username,
         email=user.email,
         hashed_password=hashed_password
     )
-    
+
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
     return db_user
 
-def authenticate_user(db: Session, user_login: UserLogin):
-    user = db.query(User).filter(User.username == user_login.username).first()
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect username or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    if not verify_password(user_login.password, user.hashed_password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect username or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
+def _get_user_by_username(db: Session, username: str):
+    return db.query(User).filter(User.username == username).first()
+
+def _invalid_credentials():
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Incorrect username or password",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+def _issue_token(user: User):
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.username, "id": user.id},
         expires_delta=access_token_expires
     )
-    
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+
+    return {"access_token": access_token, "token_type": "bearer"}
+
+def create_user(db: Session, user: UserCreate):
+    _check_user_available(db, user)
+
+    # Create new user
+    hashed_password = hash_password(user.password)
+    return _insert_user(db, user, hashed_password)
+
+def authenticate_user(db: Session, user_login: UserLogin):
+    user = _get_user_by_username(db, user_login.username)
+
+    if not user:
+        raise _invalid_credentials()
+
+    if not check_password(user_login.password, user.hashed_password):
+        raise _invalid_credentials()
+
+    return _issue_token(user)
+
+# Async entry points. Password hashing runs on the dedicated hashing pool, and
+# queries run over an AsyncSession when DB_MODE=async.
+async def create_user_async(db: DBSession, user: UserCreate):
+    await run_db(db, _check_user_available, user)
+    hashed_password = await get_password_hash_async(user.password)
+    return await run_db(db, _insert_user, user, hashed_password)
+
+async def authenticate_user_async(db: DBSession, user_login: UserLogin):
+    user = await run_db(db, _get_user_by_username, user_login.username)
+
+    if not user:
+        raise _invalid_credentials()
+
+    if not await verify_password_async(user_login.password, user.hashed_password):
+        raise _invalid_credentials()
+
+    return _issue_token(user)
@@ -0,0 +1,126 @@
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timezone
+from itertools import islice
+from typing import List, Optional, Tuple
+from app.config import settings
+
+
+def _position(item: dict) -> tuple:
+    return item["created_at"], item["id"]
+
+
+def _stored_form(value: datetime, like: datetime) -> datetime:
+    """`value` in UTC, naive when `like` is (as SQLite hands timestamps back), so the two compare"""
+    value = value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return value if like.tzinfo else value.replace(tzinfo=None)
+
+
+class HomeFeed:
+    """The newest HOME_FEED_SIZE post summaries, newest first, shaped as listing items.
+
+    Rebuilt from the database when cold, when the listing generation has moved
+    past the one it reflects (a change it did not see, e.g. from another
+    worker), or after HOME_FEED_MAX_AGE_SECONDS. This worker's own creates,
+    edits and deletes are applied in place and then `advance` the generation.
+    """
+
+    def __init__(self, capacity: int, max_age: float):
+        self.capacity = capacity
+        self.max_age = max_age
+        self.rebuild_lock = asyncio.Lock()
+        self._items: deque = deque(maxlen=max(capacity, 1))
+        # Number of posts overall, for listing totals
+        self._total: Optional[int] = None
+        self._generation: Optional[int] = None
+        self._built_at = 0.0
+        self._stale = True
+        # Bumped by every change, so a rebuild that raced one is not trusted
+        self._changes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    @property
+    def total(self) -> Optional[int]:
+        return self._total
+
+    def is_current(self, generation: int) -> bool:
+        return (
+            not self._stale
+            and self._generation == generation
+            and time.monotonic() - self._built_at < self.max_age
+        )
+
+    def begin_rebuild(self) -> int:
+        return self._changes
+
+    def replace(self, token: int, items: List[dict], total: int, generation: int) -> None:
+        """Install a freshly loaded feed; `generation` must have been read before loading it"""
+        self._items = deque(items, maxlen=max(self.capacity, 1))
+        self._total = total
+        self._generation = generation
+        self._built_at = time.monotonic()
+        self._stale = token != self._changes
+
+    def mark_stale(self) -> None:
+        self._changes += 1
+        self._stale = True
+
+    def advance(self, generation: int) -> None:
+        """Record that a change already applied here moved the listing generation to `generation`"""
+        if self._generation == generation - 1:
+            self._generation = generation
+        elif self._generation != generation:
+            self._stale = True
+
+    def add(self, item: dict) -> None:
+        self._changes += 1
+        if self._total is None:
+            return
+        if self._items and _position(item) < _position(self._items[0]):
+            # Not the newest post after all (clock skew); reload rather than insert mid-buffer
+            self._stale = True
+            return
+        self._items.appendleft(item)
+        self._total += 1
+
+    def update(self, item: dict) -> None:
+        self._changes += 1
+        for index, existing in enumerate(self._items):
+            if existing["id"] == item["id"]:
+                self._items[index] = item
+                return
+
+    def remove(self, post_id: int) -> None:
+        self._changes += 1
+        if self._total is None:
+            return
+        for index, existing in enumerate(self._items):
+            if existing["id"] == post_id:
+                del self._items[index]
+                break
+        self._total -= 1
+        if len(self._items) < self.capacity // 2 and self._total > len(self._items):
+            # Deletes have eaten into the buffer; refill it
+            self._stale = True
+
+    def window(self, skip: int, limit: int, cursor: Optional[tuple] = None) -> Optional[Tuple[List[dict], bool]]:
+        """Items for one page and whether more follow, or None when the page reaches past the buffer"""
+        items = self._items
+        if cursor is not None:
+            if items:
+                cursor = (_stored_form(cursor[0], items[0]["created_at"]), cursor[1])
+            skip = next((index for index, item in enumerate(items) if _position(item) < cursor), len(items))
+        end = skip + limit
+        if end < len(items):
+            return list(islice(items, skip, end)), True
+        if self._total is not None and len(items) >= self._total:
+            # The buffer holds every post, so this is the last page
+            return list(islice(items, skip, end)), False
+        return None
+
+
+home_feed = HomeFeed(settings.HOME_FEED_SIZE, settings.HOME_FEED_MAX_AGE_SECONDS)
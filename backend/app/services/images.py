@@ -0,0 +1,178 @@
+import asyncio
+import io
+import json
+import logging
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from sqlalchemy import update
+from app.config import settings
+from app.database import SessionLocal
+from app.models.post import Post
+from app.services.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+# Derivative name -> maximum width in pixels; images are never upscaled
+DERIVATIVE_WIDTHS = {"thumbnail": 320, "card": 800, "full": 1600}
+QUALITY = {"image/webp": 80, "image/avif": 55}
+
+
+def _output_formats() -> Dict[str, str]:
+    """MIME type -> Pillow format name for the encoders available in this install"""
+    from PIL import Image, features
+
+    try:
+        import pillow_avif  # noqa: F401  registers the AVIF plugin on Pillow without native support
+    except ImportError:
+        pass
+    Image.init()
+
+    formats = {}
+    if "AVIF" in Image.SAVE:
+        formats["image/avif"] = "AVIF"
+    if features.check("webp"):
+        formats["image/webp"] = "WEBP"
+    return formats
+
+
+def srcset_map(variants: Optional[List[dict]]) -> Optional[Dict[str, str]]:
+    """srcset strings keyed by MIME type, ready for <source type=... srcset=...>"""
+    if not variants:
+        return None
+    by_type: Dict[str, List[dict]] = {}
+    for variant in variants:
+        by_type.setdefault(variant["type"], []).append(variant)
+    return {
+        mime: ", ".join(f"{v['url']} {v['width']}w" for v in sorted(items, key=lambda v: v["width"]))
+        for mime, items in by_type.items()
+    }
+
+
+def build_derivatives(source_key: str) -> List[dict]:
+    """Resize and re-encode one stored upload; idempotent thanks to a per-source manifest"""
+    from PIL import Image, ImageOps
+
+    storage = get_storage()
+    stem = posixpath.splitext(posixpath.basename(source_key))[0]
+    base = f"derivatives/{stem}"
+    manifest_key = f"{base}/manifest.json"
+    if storage.exists(manifest_key):
+        return json.loads(storage.get_bytes(manifest_key))
+
+    with Image.open(io.BytesIO(storage.get_bytes(source_key))) as original:
+        image = ImageOps.exif_transpose(original)
+        image.load()
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+    formats = _output_formats()
+    variants = []
+    emitted_widths = set()
+    for name, max_width in DERIVATIVE_WIDTHS.items():
+        width = min(max_width, image.width)
+        if width in emitted_widths:
+            # Small originals: no point storing the same size twice
+            continue
+        emitted_widths.add(width)
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for mime, pil_format in formats.items():
+            buffer = io.BytesIO()
+            resized.save(buffer, pil_format, quality=QUALITY[mime])
+            key = f"{base}/{name}.{pil_format.lower()}"
+            storage.put_bytes(key, buffer.getvalue(), mime)
+            variants.append({
+                "name": name,
+                "type": mime,
+                "width": width,
+                "height": height,
+                "url": storage.url_for(key)
+            })
+
+    storage.put_bytes(manifest_key, json.dumps(variants).encode(), "application/json")
+    return variants
+
+
+def record_derivatives(image_url: str, variants: List[dict]) -> List[int]:
+    """Attach variants to every post showing this image; returns the updated post ids"""
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            update(Post)
+            .where(Post.image_url == image_url)
+            .values(image_variants=variants)
+            .returning(Post.id)
+        )
+        post_ids = list(result.scalars())
+        db.commit()
+        return post_ids
+    finally:
+        db.close()
+
+
+class DerivativePipeline:
+    """Background worker pool producing image derivatives for uploads.
+
+    Jobs run on threads: Pillow releases the GIL while decoding, resizing and
+    encoding. Requests for an image already being processed are coalesced.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self) -> None:
+        """Remember the app's event loop so finished jobs can invalidate cached responses"""
+        self._loop = asyncio.get_running_loop()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="image-derivatives")
+            return self._executor
+
+    def enqueue(self, image_url: Optional[str]) -> bool:
+        """Queue derivative generation for one of our uploads; foreign URLs are ignored"""
+        if not image_url or self.workers <= 0:
+            return False
+        source_key = get_storage().key_for_url(image_url)
+        if source_key is None or source_key.startswith("derivatives/"):
+            return False
+        with self._lock:
+            if image_url in self._in_flight:
+                return True
+            self._in_flight.add(image_url)
+        self._get_executor().submit(self._run, image_url, source_key)
+        return True
+
+    def _run(self, image_url: str, source_key: str) -> None:
+        try:
+            variants = build_derivatives(source_key)
+            post_ids = record_derivatives(image_url, variants)
+            loop = self._loop
+            if post_ids and loop is not None and not loop.is_closed():
+                from app.services.feed import home_feed
+                from app.services.response_cache import invalidate_post
+
+                home_feed.mark_stale()
+                for post_id in post_ids:
+                    asyncio.run_coroutine_threadsafe(invalidate_post(post_id), loop)
+        except Exception:
+            logger.exception("Failed to build derivatives for %s", image_url)
+        finally:
+            with self._lock:
+                self._in_flight.discard(image_url)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+derivative_pipeline = DerivativePipeline(settings.IMAGE_WORKERS)
@@ -1,64 +1,149 @@
+import base64
+import binascii
+import html
+import json
+import re
+from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from typing import Optional, List, Tuple
-from sqlalchemy import or_
-from app.models.post import Post
+from sqlalchemy import case, delete, func, insert, null, tuple_, update
+from app.models.post import Post, PostTombstone
 from app.models.user import User
-from app.schemas.post import PostCreate, PostUpdate
+from app.schemas.auth import UserPrincipal
+from app.schemas.post import PostCreate, PostUpdate, CountMode, PostFields
 from app.config import settings
+from app.database import DBSession, run_db, run_on_primary, timestamp_bound
+from app.services.search import get_search_backend
+from app.services.response_cache import get_response_cache, invalidate_listings, invalidate_post
+from app.services.feed import home_feed
+from app.services.images import derivative_pipeline, srcset_map
+from app.services.user import adjust_post_counter
+from app.utils.cache import TTLCache
+from app.utils.replicas import mark_recent_write
+from app.utils.request_metrics import timed
 
-def create_blog_post(db: Session, blog_post: PostCreate, current_user: User):
-    db_blog_post = Post(
-        title=blog_post.title,
-        content=blog_post.content,
-        image_url=blog_post.image_url,
-        user_id=current_user.id
-    )
-    
-    db.add(db_blog_post)
-    db.commit()
-    db.refresh(db_blog_post)
+# Per-filter total counts, keyed by (author id or None, search term)
+_count_cache = TTLCache(
+    max_entries=settings.COUNT_CACHE_MAX_ENTRIES,
+    ttl=settings.COUNT_CACHE_TTL_SECONDS
+)
+
+def invalidate_post_counts(user_id: Optional[int] = None):
+    """Drop cached counts that a post created, edited or deleted by `user_id` could change"""
+    if user_id is None:
+        _count_cache.clear()
+    else:
+        _count_cache.delete_where(lambda key: key[0] is None or key[0] == user_id)
+
+def make_excerpt(content: str, length: int = settings.EXCERPT_LENGTH) -> str:
+    """Build the plain-text excerpt stored alongside a post for listings"""
+    # Strip markup and collapse whitespace so the excerpt is plain text
+    text = re.sub(r"\s+", " ", html.unescape(re.sub(r"<[^>]+>", " ", content))).strip()
+    if len(text) <= length:
+        return text
+    cut = text[:length]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.rstrip(" .,;:") + "…"
+
+# Columns behind a PostResponse, minus the author's username
+_POST_COLUMNS = (
+    Post.id,
+    Post.title,
+    Post.content,
+    Post.image_url,
+    Post.image_variants,
+    Post.user_id,
+    Post.created_at,
+    Post.updated_at
+)
+
+def _post_response(row, author_username: str) -> dict:
+    """Helper function to build a PostResponse-shaped dict from a post row"""
     return {
-        "id": db_blog_post.id,
-        "title": db_blog_post.title,
-        "content": db_blog_post.content,
-        "image_url": db_blog_post.image_url,
-        "user_id": db_blog_post.user_id,
-        "created_at": db_blog_post.created_at,
-        "updated_at": db_blog_post.updated_at,
-        "author_username": current_user.username 
+        "id": row.id,
+        "title": row.title,
+        "content": row.content,
+        "image_url": row.image_url,
+        "image_srcset": srcset_map(row.image_variants),
+        "user_id": row.user_id,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+        "author_username": author_username
     }
 
-def get_blog_post(db: Session, post_id: int, current_user: User):
-    db_blog_post = db.query(Post).filter(Post.id == post_id).first()
+def _missing_or_forbidden(db: Session, post_id: int, action: str) -> HTTPException:
+    """Helper function explaining why an ownership-filtered statement matched nothing"""
+    if db.query(Post.id).filter(Post.id == post_id).first() is None:
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Blog post not found"
+        )
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=f"Not authorized to {action} this blog post"
+    )
+
+def create_blog_post(db: Session, blog_post: PostCreate, current_user: UserPrincipal):
+    # INSERT ... RETURNING hands back server defaults without a refresh query
+    row = db.execute(
+        insert(Post)
+        .values(
+            title=blog_post.title,
+            content=blog_post.content,
+            excerpt=make_excerpt(blog_post.content),
+            image_url=blog_post.image_url,
+            user_id=current_user.id
+        )
+        .returning(*_POST_COLUMNS)
+    ).first()
+    adjust_post_counter(db, current_user.id, 1)
+    db.commit()
+    invalidate_post_counts(current_user.id)
+    get_search_backend().index_post(row.id, row.title, row.content, row.user_id, row.created_at)
+    return _post_response(row, current_user.username)
+
+def get_blog_post(db: Session, post_id: int, current_user: UserPrincipal):
+    # Post and author in one round trip
+    row = (
+        db.query(*_POST_COLUMNS, User.username.label("author_username"))
+        .outerjoin(User, Post.user_id == User.id)
+        .filter(Post.id == post_id)
+        .first()
+    )
     
-    if not db_blog_post:
+    if not row:
         return None
-        
-    # Get the author's username
-    author = db.query(User).filter(User.id == db_blog_post.user_id).first()
-    author_username = author.username if author else "Unknown"
     
-    return {
-        "id": db_blog_post.id,
-        "title": db_blog_post.title,
-        "content": db_blog_post.content,
-        "image_url": db_blog_post.image_url,
-        "user_id": db_blog_post.user_id,
-        "created_at": db_blog_post.created_at,
-        "updated_at": db_blog_post.updated_at,
-        "author_username": author_username
-    }
+    return _post_response(row, row.author_username or "Unknown")
 
-def _process_posts_query_results(posts) -> List[dict]:
+def _listing_query(db: Session, fields: PostFields):
+    """Helper function to build the listing query, selecting the post body only for the full shape"""
+    body = Post.content if fields == PostFields.FULL else Post.excerpt
+    return db.query(
+        Post.id,
+        Post.title,
+        body,
+        Post.image_url,
+        Post.image_variants,
+        Post.user_id,
+        Post.created_at,
+        Post.updated_at,
+        User.username.label("author_username")
+    ).join(User, Post.user_id == User.id)
+
+def _process_posts_query_results(posts, fields: PostFields = PostFields.FULL) -> List[dict]:
     """Helper function to process query results into dictionaries"""
+    body_field = "content" if fields == PostFields.FULL else "excerpt"
     result = []
     for post in posts:
         post_dict = {
             "id": post.id,
             "title": post.title,
-            "content": post.content,
+            body_field: getattr(post, body_field),
             "image_url": post.image_url,
+            "image_srcset": srcset_map(post.image_variants),
             "user_id": post.user_id,
             "created_at": post.created_at,
             "updated_at": post.updated_at,
@@ -67,107 +152,241 @@ def _process_posts_query_results(posts) -> List[dict]:
         result.append(post_dict)
     return result
 
-def _calculate_pagination(total: int, skip: int, limit: int) -> Tuple[int, int, int]:
+def _calculate_pagination(total: Optional[int], skip: int, limit: int) -> Tuple[int, int, Optional[int]]:
     """Helper function to calculate pagination metadata"""
     page = skip // limit + 1 if limit > 0 else 1
+    if total is None:
+        return page, limit, None
     pages = (total + limit - 1) // limit if limit > 0 else 1
     return page, limit, pages
 
+def _estimate_count(db: Session, query) -> Optional[int]:
+    """Helper function to read the planner's row estimate for a query (PostgreSQL only)"""
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+
+    compiled = query.statement.compile(dialect=bind.dialect)
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+
+    plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+def _count_posts(db: Session, query, count_mode: CountMode, cache_key: tuple) -> Optional[int]:
+    """Helper function to count matching posts according to the requested count mode.
+
+    `estimated` serves a per-filter cached count while it is fresh; on a miss it
+    falls back to the planner estimate on PostgreSQL, or an exact count elsewhere.
+    """
+    if count_mode == CountMode.NONE:
+        return None
+    if count_mode == CountMode.EXACT:
+        return query.count()
+
+    total = _count_cache.get(cache_key)
+    if total is None:
+        total = _estimate_count(db, query)
+        if total is None:
+            total = query.count()
+        _count_cache.set(cache_key, total)
+    return total
+
+def encode_cursor(created_at: datetime, post_id: int) -> str:
+    """Encode the (created_at, id) position of a post into an opaque cursor"""
+    payload = json.dumps({"c": created_at.isoformat(), "i": post_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode an opaque cursor back into its (created_at, id) position, in UTC"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = datetime.fromisoformat(payload["c"])
+        # SQLite hands back naive datetimes, which are stored in UTC; cursors from Postgres carry an offset
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return created_at.astimezone(timezone.utc), int(payload["i"])
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def _paginate(query, skip: int, limit: int, cursor: Optional[str], rank=None):
+    """Helper function to fetch one page ordered by (created_at, id), newest first.
+
+    With a cursor the query seeks past the cursor position on the
+    (created_at, id) index instead of scanning and discarding `skip` rows.
+    Ranked search results are ordered by relevance and only page by offset.
+    Returns the page rows and the cursor for the following page, if any.
+    """
+    if rank is not None:
+        if cursor:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor pagination is not available for ranked search results"
+            )
+        posts = query.order_by(rank.desc(), Post.created_at.desc(), Post.id.desc()).offset(skip).limit(limit).all()
+        return posts, None
+
+    query = query.order_by(Post.created_at.desc(), Post.id.desc())
+
+    if cursor:
+        created_at, post_id = decode_cursor(cursor)
+        query = query.filter(tuple_(Post.created_at, Post.id) < tuple_(timestamp_bound(query.session, created_at), post_id))
+    else:
+        query = query.offset(skip)
+
+    # Fetch one extra row to know whether another page follows
+    posts = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = encode_cursor(posts[-1].created_at, posts[-1].id)
+    return posts, next_cursor
+
+def _ranked_search_page(
+    db: Session,
+    search: str,
+    user_id: Optional[int],
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    count_mode: CountMode,
+    fields: PostFields
+) -> Optional[dict]:
+    """Helper function to serve a search page from a backend that ranks in process, or None when it does not.
+
+    Only the page's ids reach the database, whatever the number of matches.
+    """
+    ranked = get_search_backend().page(db, search, user_id, skip, limit)
+    if ranked is None:
+        return None
+    if cursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor pagination is not available for ranked search results"
+        )
+    post_ids, matches = ranked
+    query = _listing_query(db, fields)
+    rows = {row.id: row for row in query.filter(Post.id.in_(post_ids))} if post_ids else {}
+    # Posts deleted by another process may still be in this one's index
+    posts = [rows[post_id] for post_id in post_ids if post_id in rows]
+    total = None if count_mode == CountMode.NONE else matches
+    page, limit, pages = _calculate_pagination(total, skip, limit)
+    return {
+        "items": _process_posts_query_results(posts, fields),
+        "total": total,
+        "page": page,
+        "size": limit,
+        "pages": pages,
+        "next_cursor": None,
+        "count_mode": count_mode
+    }
+
 def get_blog_posts(
     db: Session, 
     skip: int = 0, 
     limit: int = settings.DEFAULT_PAGE_SIZE,
-    search: Optional[str] = None
-) -> Tuple[List[dict], int, int, int, int]:
-    query = db.query(
-        Post.id,
-        Post.title,
-        Post.content,
-        Post.image_url,
-        Post.user_id,
-        Post.created_at,
-        Post.updated_at,
-        User.username.label("author_username")
-    ).join(User, Post.user_id == User.id)
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    count_mode: CountMode = CountMode.EXACT,
+    fields: PostFields = PostFields.SUMMARY
+) -> dict:
+    if search:
+        ranked = _ranked_search_page(db, search, None, skip, limit, cursor, count_mode, fields)
+        if ranked is not None:
+            return ranked
+    
+    query = _listing_query(db, fields)
     
     # Apply search if provided
+    rank = None
     if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Post.title.ilike(search_term),
-                Post.content.ilike(search_term)
-            )
-        )
+        query, rank = get_search_backend().apply(db, query, search)
     
     # Count total matching posts for pagination
-    total = query.count()
+    with timed("count"):
+        total = _count_posts(db, query, count_mode, (None, search or ""))
     
-    # Order by most recent first
-    query = query.order_by(Post.created_at.desc())
-    
-    # Apply pagination
-    posts = query.offset(skip).limit(limit).all()
+    # Apply pagination, most recent first
+    if cursor:
+        skip = 0
+    posts, next_cursor = _paginate(query, skip, limit, cursor, rank)
     
     # Calculate pagination metadata
     page, limit, pages = _calculate_pagination(total, skip, limit)
     
     # Process results
-    result = _process_posts_query_results(posts)
+    result = _process_posts_query_results(posts, fields)
     
-    # Return both the items and total for pagination
-    return result, total, page, limit, pages
+    return {
+        "items": result,
+        "total": total,
+        "page": page,
+        "size": limit,
+        "pages": pages,
+        "next_cursor": next_cursor,
+        "count_mode": count_mode
+    }
 
-def update_blog_post(db: Session, post_id: int, blog_update: PostUpdate, current_user: User):
-    # Check if post exists
-    db_blog_post = db.query(Post).filter(Post.id == post_id).first()
+def update_blog_post(db: Session, post_id: int, blog_update: PostUpdate, current_user: UserPrincipal):
+    # Update only provided fields
+    update_data = blog_update.model_dump(exclude_unset=True)
+    if not update_data:
+        row = db.query(*_POST_COLUMNS).filter(Post.id == post_id, Post.user_id == current_user.id).first()
+        if not row:
+            raise _missing_or_forbidden(db, post_id, "update")
+        return _post_response(row, current_user.username)
     
-    if not db_blog_post:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Blog post not found"
+    if update_data.get("content") is not None:
+        update_data["excerpt"] = make_excerpt(update_data["content"])
+    if "image_url" in update_data:
+        # Variants of the old image no longer apply; the pipeline rebuilds them
+        update_data["image_variants"] = case(
+            (Post.image_url.is_not_distinct_from(update_data["image_url"]), Post.image_variants),
+            else_=null()
         )
     
-    if db_blog_post.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to update this blog post"
-        )
-    
-    # Update only provided fields
-    update_data = blog_update.model_dump(exclude_unset=True)
-    db.query(Post).filter(Post.id == post_id).update(update_data)
+    # Ownership check, update and read-back in a single statement
+    row = db.execute(
+        update(Post)
+        .where(Post.id == post_id, Post.user_id == current_user.id)
+        .values(**update_data)
+        .returning(*_POST_COLUMNS)
+    ).first()
+    if not row:
+        db.rollback()
+        raise _missing_or_forbidden(db, post_id, "update")
     db.commit()
-    db.refresh(db_blog_post)
+    if "title" in update_data or "content" in update_data:
+        # New text can move the post in or out of searches, and so their totals
+        invalidate_post_counts(current_user.id)
+    get_search_backend().index_post(row.id, row.title, row.content, row.user_id, row.created_at)
     
-    return {
-        "id": db_blog_post.id,
-        "title": db_blog_post.title,
-        "content": db_blog_post.content,
-        "image_url": db_blog_post.image_url,
-        "user_id": db_blog_post.user_id,
-        "created_at": db_blog_post.created_at,
-        "updated_at": db_blog_post.updated_at,
-        "author_username": current_user.username
-    }
+    return _post_response(row, current_user.username)
 
-def delete_blog_post(db: Session, post_id: int, current_user: User):
-    blog_post = db.query(Post).filter(Post.id == post_id).first()
+def delete_blog_post(db: Session, post_id: int, current_user: UserPrincipal):
+    deleted = db.execute(
+        delete(Post)
+        .where(Post.id == post_id, Post.user_id == current_user.id)
+        .returning(Post.id)
+    ).first()
     
-    if not blog_post:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Blog post not found"
-        )
-    
-    if blog_post.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to delete this blog post"
-        )
+    if not deleted:
+        db.rollback()
+        raise _missing_or_forbidden(db, post_id, "delete")
     
-    db.delete(blog_post)
+    # Lets the change feed report the delete
+    db.execute(insert(PostTombstone).values(post_id=post_id, user_id=current_user.id))
+    adjust_post_counter(db, current_user.id, -1)
     db.commit()
+    invalidate_post_counts(current_user.id)
+    get_search_backend().remove_post(post_id)
     return {"message": "Blog post deleted successfully"}
 
 def get_user_posts(
@@ -175,51 +394,159 @@ def get_user_posts(
     user_id: int,
     skip: int = 0, 
     limit: int = settings.DEFAULT_PAGE_SIZE,
-    search: Optional[str] = None
-) -> Tuple[List[dict], int, int, int, int]:
-    # First verify the user exists
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    count_mode: CountMode = CountMode.EXACT,
+    fields: PostFields = PostFields.SUMMARY
+) -> dict:
+    # Verify the user exists, reading their post counter on the way
+    author = db.query(User.post_count).filter(User.id == user_id).first()
+    if not author:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    query = db.query(
-        Post.id,
-        Post.title,
-        Post.content,
-        Post.image_url,
-        Post.user_id,
-        Post.created_at,
-        Post.updated_at,
-        User.username.label("author_username")
-    ).join(User, Post.user_id == User.id).filter(Post.user_id == user_id)
+    if search:
+        ranked = _ranked_search_page(db, search, user_id, skip, limit, cursor, count_mode, fields)
+        if ranked is not None:
+            return ranked
+    
+    query = _listing_query(db, fields).filter(Post.user_id == user_id)
     
     # Apply search if provided
+    rank = None
     if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Post.title.ilike(search_term),
-                Post.content.ilike(search_term)
-            )
-        )
+        query, rank = get_search_backend().apply(db, query, search)
     
     # Count total matching posts for pagination
-    total = query.count()
+    with timed("count"):
+        if search or count_mode == CountMode.NONE:
+            total = _count_posts(db, query, count_mode, (user_id, search or ""))
+        else:
+            # The author's counter is exact, so no count over posts is needed
+            total = author.post_count
     
-    # Order by most recent first
-    query = query.order_by(Post.created_at.desc())
-    
-    # Apply pagination
-    posts = query.offset(skip).limit(limit).all()
+    # Apply pagination, most recent first
+    if cursor:
+        skip = 0
+    posts, next_cursor = _paginate(query, skip, limit, cursor, rank)
     
     # Calculate pagination metadata
     page, limit, pages = _calculate_pagination(total, skip, limit)
     
     # Process results
-    result = _process_posts_query_results(posts)
+    result = _process_posts_query_results(posts, fields)
     
-    # Return both the items and total for pagination
-    return result, total, page, limit, pages
\ No newline at end of file
+    return {
+        "items": result,
+        "total": total,
+        "page": page,
+        "size": limit,
+        "pages": pages,
+        "next_cursor": next_cursor,
+        "count_mode": count_mode
+    }
+
+def _load_home_feed(db: Session, limit: int) -> Tuple[List[dict], int]:
+    """Helper function to load the newest `limit` post summaries and the number of posts"""
+    posts = _listing_query(db, PostFields.SUMMARY).order_by(Post.created_at.desc(), Post.id.desc()).limit(limit).all()
+    total = db.query(func.count(Post.id)).scalar()
+    return _process_posts_query_results(posts, PostFields.SUMMARY), total
+
+def _feed_item(post: dict) -> dict:
+    """Helper function to turn a PostResponse-shaped dict into the home feed's summary item"""
+    return {
+        "id": post["id"],
+        "title": post["title"],
+        "excerpt": make_excerpt(post["content"]),
+        "image_url": post["image_url"],
+        "image_srcset": post["image_srcset"],
+        "user_id": post["user_id"],
+        "created_at": post["created_at"],
+        "updated_at": post["updated_at"],
+        "author_username": post["author_username"]
+    }
+
+async def _home_feed_page(skip: int, limit: int, cursor: Optional[str], count_mode: CountMode) -> Optional[dict]:
+    """Helper function to serve an unfiltered summary page from the home feed, or None when it reaches past it"""
+    if not cursor and skip + limit >= home_feed.capacity:
+        return None
+    position = decode_cursor(cursor) if cursor else None
+
+    cache = get_response_cache()
+    if not home_feed.is_current(await cache.listing_generation()):
+        async with home_feed.rebuild_lock:
+            # Read before loading, so a write that lands meanwhile leaves the feed behind, not ahead
+            generation = await cache.listing_generation()
+            if not home_feed.is_current(generation):
+                token = home_feed.begin_rebuild()
+                # From the primary: the feed is installed as current for `generation`,
+                # which a replica's snapshot may not have caught up with yet
+                items, total = await run_on_primary(_load_home_feed, home_feed.capacity)
+                home_feed.replace(token, items, total, generation)
+
+    window = home_feed.window(0 if cursor else skip, limit, position)
+    if window is None:
+        return None
+    items, has_more = window
+    total = None if count_mode == CountMode.NONE else home_feed.total
+    page, limit, pages = _calculate_pagination(total, 0 if cursor else skip, limit)
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "size": limit,
+        "pages": pages,
+        "next_cursor": encode_cursor(items[-1]["created_at"], items[-1]["id"]) if has_more and items else None,
+        "count_mode": count_mode
+    }
+
+# Async entry points: the same service logic, run over an AsyncSession when
+# DB_MODE=async. Mutations also invalidate the response cache and apply
+# themselves to this worker's home feed.
+async def create_blog_post_async(db: DBSession, blog_post: PostCreate, current_user: UserPrincipal):
+    post = await run_db(db, create_blog_post, blog_post, current_user)
+    mark_recent_write(current_user.id)
+    home_feed.add(_feed_item(post))
+    home_feed.advance(await invalidate_listings())
+    derivative_pipeline.enqueue(post["image_url"])
+    return post
+
+async def get_blog_post_async(db: DBSession, post_id: int, current_user: UserPrincipal):
+    return await run_db(db, get_blog_post, post_id, current_user)
+
+async def get_blog_posts_async(
+    db: DBSession,
+    skip: int = 0,
+    limit: int = settings.DEFAULT_PAGE_SIZE,
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    count_mode: CountMode = CountMode.EXACT,
+    fields: PostFields = PostFields.SUMMARY
+) -> dict:
+    # The first pages of the unfiltered feed come from memory
+    if home_feed.enabled and not search and fields == PostFields.SUMMARY:
+        page = await _home_feed_page(skip, limit, cursor, count_mode)
+        if page is not None:
+            return page
+    return await run_db(db, get_blog_posts, skip, limit, search, cursor, count_mode, fields)
+
+async def update_blog_post_async(db: DBSession, post_id: int, blog_update: PostUpdate, current_user: UserPrincipal):
+    post = await run_db(db, update_blog_post, post_id, blog_update, current_user)
+    mark_recent_write(current_user.id)
+    home_feed.update(_feed_item(post))
+    home_feed.advance(await invalidate_post(post_id))
+    if "image_url" in blog_update.model_fields_set and post["image_srcset"] is None:
+        derivative_pipeline.enqueue(post["image_url"])
+    return post
+
+async def delete_blog_post_async(db: DBSession, post_id: int, current_user: UserPrincipal):
+    result = await run_db(db, delete_blog_post, post_id, current_user)
+    mark_recent_write(current_user.id)
+    home_feed.remove(post_id)
+    home_feed.advance(await invalidate_post(post_id))
+    return result
+
+async def get_user_posts_async(db: DBSession, user_id: int, *args, **kwargs) -> dict:
+    return await run_db(db, get_user_posts, user_id, *args, **kwargs)
@@ -0,0 +1,142 @@
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import DBSession, run_db, timestamp_bound
+from app.models.post import Post, PostTombstone
+from app.models.user import User
+from app.services.post import _POST_COLUMNS, _post_response
+
+Position = Tuple[datetime, int]
+
+
+def _after(db: Session, changed_at_column, id_column, position: Position):
+    changed_at, row_id = position
+    return tuple_(changed_at_column, id_column) > tuple_(timestamp_bound(db, changed_at), row_id)
+
+
+def encode_change_token(post_position: Optional[Position], tombstone_position: Position) -> str:
+    """Encode how far a client has read both streams, posts and tombstones, into an opaque token"""
+    payload = json.dumps({
+        "p": [post_position[0].isoformat(), post_position[1]] if post_position else None,
+        "t": [tombstone_position[0].isoformat(), tombstone_position[1]]
+    }, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_change_token(token: str) -> Tuple[Optional[Position], Position]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        post_position = (datetime.fromisoformat(payload["p"][0]), int(payload["p"][1])) if payload["p"] else None
+        return post_position, (datetime.fromisoformat(payload["t"][0]), int(payload["t"][1]))
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError, IndexError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid change token"
+        )
+
+
+def get_post_changes(db: Session, since: Optional[str] = None, limit: int = settings.CHANGES_BATCH_SIZE) -> dict:
+    """Up to `limit` posts created, edited or deleted after the `since` token, oldest change first.
+
+    Without a token the feed starts from the beginning, so a new client walks
+    every post once and then only sees what changes. Posts are read in
+    (updated_at, id) order and deletes from the tombstone table in
+    (deleted_at, id) order, both stopping CHANGES_SAFETY_LAG_SECONDS short of
+    the database clock; every change older than that has committed, so
+    nothing can appear behind a position already handed out.
+    """
+    now = db.scalar(select(func.now()))
+    bound = now - timedelta(seconds=settings.CHANGES_SAFETY_LAG_SECONDS)
+    if since:
+        post_position, tombstone_position = decode_change_token(since)
+        try:
+            expired = tombstone_position[0] < now - timedelta(days=settings.CHANGES_TOMBSTONE_RETENTION_DAYS)
+        except TypeError:
+            # A naive timestamp against an aware clock: not a token this database issued
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid change token")
+        if expired:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Change token expired; sync again from the start without `since`"
+            )
+    else:
+        # A client starting from nothing needs no deletes older than its first batch
+        post_position, tombstone_position = None, (bound, 0)
+
+    posts_query = (
+        db.query(*_POST_COLUMNS, User.username.label("author_username"))
+        .outerjoin(User, Post.user_id == User.id)
+        .filter(Post.updated_at <= timestamp_bound(db, bound))
+    )
+    if post_position:
+        posts_query = posts_query.filter(_after(db, Post.updated_at, Post.id, post_position))
+    # One extra row from each stream tells whether more changes follow
+    posts = posts_query.order_by(Post.updated_at, Post.id).limit(limit + 1).all()
+
+    tombstones = (
+        db.query(PostTombstone.id, PostTombstone.post_id, PostTombstone.deleted_at)
+        .filter(
+            PostTombstone.deleted_at <= timestamp_bound(db, bound),
+            _after(db, PostTombstone.deleted_at, PostTombstone.id, tombstone_position)
+        )
+        .order_by(PostTombstone.deleted_at, PostTombstone.id)
+        .limit(limit + 1)
+        .all()
+    )
+
+    # Merge the two streams by time; on a tie the delete goes first, as a post
+    # updated and then deleted leaves only its tombstone behind
+    changes = sorted(
+        [(row.deleted_at, 0, row.id, row) for row in tombstones]
+        + [(row.updated_at, 1, row.id, row) for row in posts],
+        key=lambda change: change[:3]
+    )
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    items = []
+    for changed_at, kind, row_id, row in changes:
+        if kind == 0:
+            tombstone_position = (changed_at, row_id)
+            items.append({"id": row.post_id, "deleted": True, "changed_at": changed_at, "post": None})
+        else:
+            post_position = (changed_at, row_id)
+            items.append({
+                "id": row.id,
+                "deleted": False,
+                "changed_at": changed_at,
+                "post": _post_response(row, row.author_username or "Unknown")
+            })
+
+    taken_tombstones = sum(1 for change in changes if change[1] == 0)
+    if taken_tombstones == len(tombstones) <= limit:
+        # Every delete up to the bound has been read: move the token up to it, so a
+        # client with nothing to hear about is not sent away once old tombstones are pruned
+        tombstone_position = max(tombstone_position, (bound, 0))
+    return {
+        "items": items,
+        "next": encode_change_token(post_position, tombstone_position),
+        "has_more": has_more
+    }
+
+
+async def get_post_changes_async(db: DBSession, since: Optional[str] = None, limit: int = settings.CHANGES_BATCH_SIZE) -> dict:
+    return await run_db(db, get_post_changes, since, limit)
+
+
+def prune_tombstones(db: Session, retention_days: int = settings.CHANGES_TOMBSTONE_RETENTION_DAYS) -> int:
+    """Delete tombstones older than the retention period; returns how many were removed"""
+    cutoff = db.scalar(select(func.now())) - timedelta(days=retention_days)
+    result = db.execute(
+        delete(PostTombstone)
+        .where(PostTombstone.deleted_at < timestamp_bound(db, cutoff))
+    )
+    db.commit()
+    return result.rowcount
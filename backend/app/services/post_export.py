@@ -0,0 +1,103 @@
+import csv
+import io
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal, timestamp_bound
+from app.models.post import Post
+from app.models.user import User
+from app.schemas.post import ExportFormat
+from app.utils.serialization import dump_plain
+
+EXPORT_FIELDS = ("id", "title", "content", "image_url", "user_id", "author_username", "created_at", "updated_at")
+
+# Encoded rows are handed on in chunks of about this size rather than one write per post
+_CHUNK_BYTES = 64 * 1024
+
+
+def iter_export_rows(
+    db: Session,
+    user_id: Optional[int] = None,
+    updated_since: Optional[datetime] = None,
+    batch_size: int = settings.EXPORT_BATCH_SIZE
+) -> Iterator[dict]:
+    """Posts in id order, fetched `batch_size` rows at a time from a server-side cursor"""
+    query = (
+        db.query(
+            Post.id,
+            Post.title,
+            Post.content,
+            Post.image_url,
+            Post.user_id,
+            User.username.label("author_username"),
+            Post.created_at,
+            Post.updated_at
+        )
+        .outerjoin(User, Post.user_id == User.id)
+        .order_by(Post.id)
+        # yield_per turns on stream_results, so memory stays at one batch whatever the table size
+        .execution_options(yield_per=batch_size)
+    )
+    if user_id is not None:
+        query = query.filter(Post.user_id == user_id)
+    if updated_since is not None:
+        query = query.filter(Post.updated_at >= timestamp_bound(db, updated_since))
+    for row in query:
+        yield dict(row._mapping)
+
+
+def _chunked(pieces: Iterable[bytes]) -> Iterator[bytes]:
+    buffer, size = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= _CHUNK_BYTES:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def encode_ndjson(rows: Iterable[dict]) -> Iterator[bytes]:
+    return _chunked(dump_plain(row) + b"\n" for row in rows)
+
+
+def encode_csv(rows: Iterable[dict]) -> Iterator[bytes]:
+    def lines():
+        out = io.StringIO()
+        writer = csv.writer(out)
+
+        def written() -> bytes:
+            value = out.getvalue().encode()
+            out.seek(0)
+            out.truncate()
+            return value
+
+        writer.writerow(EXPORT_FIELDS)
+        yield written()
+        for row in rows:
+            writer.writerow([
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in (row[field] for field in EXPORT_FIELDS)
+            ])
+            yield written()
+
+    return _chunked(lines())
+
+
+ENCODERS = {ExportFormat.NDJSON: encode_ndjson, ExportFormat.CSV: encode_csv}
+MEDIA_TYPES = {ExportFormat.NDJSON: "application/x-ndjson", ExportFormat.CSV: "text/csv; charset=utf-8"}
+
+
+def export_posts(
+    export_format: ExportFormat,
+    user_id: Optional[int] = None,
+    updated_since: Optional[datetime] = None
+) -> Iterator[bytes]:
+    """Stream an export on a session of its own, which lives as long as the response body"""
+    db = SessionLocal()
+    try:
+        yield from ENCODERS[export_format](iter_export_rows(db, user_id, updated_since))
+    finally:
+        db.close()
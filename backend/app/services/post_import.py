@@ -0,0 +1,222 @@
+from datetime import datetime
+from typing import AsyncIterable, Iterable, List, Optional, Tuple
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import DBSession, run_db
+from app.models.post import Post
+from app.schemas.error import ErrorDetail
+from app.schemas.post import PostCreate
+from app.services.post import invalidate_post_counts, make_excerpt
+from app.services.search import get_search_backend
+from app.services.response_cache import invalidate_listings
+from app.services.images import derivative_pipeline
+from app.services.feed import home_feed
+from app.services.user import adjust_post_counter
+from app.utils.replicas import mark_recent_write
+
+
+def _error_details(exc: ValidationError) -> List[ErrorDetail]:
+    """Map a PostCreate validation error to ErrorDetails, keeping the validators' own details"""
+    details = []
+    for error in exc.errors():
+        original = error.get("ctx", {}).get("error")
+        if isinstance(original, ValueError) and original.args and isinstance(original.args[0], dict):
+            details.append(ErrorDetail(**original.args[0]))
+        else:
+            details.append(
+                ErrorDetail(
+                    field=".".join(str(part) for part in error["loc"]) or None,
+                    message=error["msg"],
+                    code=error["type"]
+                )
+            )
+    return details
+
+
+class PostImporter:
+    """Validates NDJSON post lines in chunks and inserts each chunk with one multi-row INSERT ... RETURNING.
+
+    Feed lines with `add_line` (calling `flush` whenever `ready` is true) and
+    finish with `flush`; `result()` is a BulkImportResult-shaped dict.
+    """
+
+    def __init__(self, user_id: int, chunk_size: int = settings.BULK_IMPORT_CHUNK_SIZE):
+        self.user_id = user_id
+        self.chunk_size = chunk_size
+        self.received = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+        self.errors_truncated = False
+        self.image_urls = set()
+        self._pending: List[Tuple[int, str]] = []
+
+    @property
+    def ready(self) -> bool:
+        return len(self._pending) >= self.chunk_size
+
+    def add_line(self, line_number: int, line: str) -> None:
+        if line.strip():
+            self.received += 1
+            self._pending.append((line_number, line))
+
+    def _record_error(self, line_number: int, errors: List[ErrorDetail]) -> None:
+        self.failed += 1
+        if len(self.errors) < settings.BULK_IMPORT_MAX_ERRORS:
+            self.errors.append({"line": line_number, "errors": errors})
+        else:
+            self.errors_truncated = True
+
+    def _validate(self, chunk: Iterable[Tuple[int, str]]) -> List[Tuple[int, PostCreate]]:
+        valid = []
+        for line_number, line in chunk:
+            try:
+                valid.append((line_number, PostCreate.model_validate_json(line)))
+            except ValidationError as exc:
+                if any(error["type"] == "json_invalid" for error in exc.errors()):
+                    self._record_error(line_number, [ErrorDetail(message="Line is not valid JSON", code="invalid_json")])
+                else:
+                    self._record_error(line_number, _error_details(exc))
+        return valid
+
+    def _row(self, post: PostCreate) -> dict:
+        return {
+            "title": post.title,
+            "content": post.content,
+            "excerpt": make_excerpt(post.content),
+            "image_url": post.image_url,
+            "user_id": self.user_id
+        }
+
+    def _insert(self, db: Session, posts: List[Tuple[int, PostCreate]]) -> List[Tuple[int, datetime]]:
+        # executemany with RETURNING is batched into multi-row INSERT statements
+        stmt = insert(Post).returning(Post.id, Post.created_at, sort_by_parameter_order=True)
+        rows = db.execute(stmt, [self._row(post) for _, post in posts]).all()
+        # Same transaction as the rows, so a failed chunk leaves the counter untouched
+        adjust_post_counter(db, self.user_id, len(rows))
+        db.commit()
+        return rows
+
+    def flush(self, db: Session) -> int:
+        """Validate and insert the pending lines; returns how many posts were committed"""
+        chunk, self._pending = self._pending, []
+        posts = self._validate(chunk)
+        if not posts:
+            return 0
+
+        try:
+            inserted = list(zip(self._insert(db, posts), posts))
+        except SQLAlchemyError:
+            db.rollback()
+            # Isolate the offending rows so the rest of the chunk still lands
+            inserted = []
+            for line_number, post in posts:
+                try:
+                    inserted.extend(zip(self._insert(db, [(line_number, post)]), [(line_number, post)]))
+                except SQLAlchemyError as exc:
+                    db.rollback()
+                    self._record_error(line_number, [ErrorDetail(message=str(getattr(exc, "orig", None) or exc), code="db_error")])
+
+        self.inserted += len(inserted)
+        search = get_search_backend()
+        for (post_id, created_at), (_, post) in inserted:
+            search.index_post(post_id, post.title, post.content, self.user_id, created_at)
+            if post.image_url:
+                self.image_urls.add(post.image_url)
+        if inserted:
+            invalidate_post_counts(self.user_id)
+        return len(inserted)
+
+    def result(self) -> dict:
+        return {
+            "received": self.received,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.errors_truncated
+        }
+
+
+async def _flush(db: DBSession, importer: PostImporter) -> None:
+    """Commit the pending chunk, then drop the cached listings and home feed its posts change"""
+    if await run_db(db, importer.flush):
+        mark_recent_write(importer.user_id)
+        home_feed.mark_stale()
+        await invalidate_listings()
+
+
+async def import_posts(db: DBSession, lines: Iterable[str], user_id: int, chunk_size: Optional[int] = None) -> dict:
+    """Import an iterable of NDJSON lines for one author"""
+    importer = PostImporter(user_id, chunk_size or settings.BULK_IMPORT_CHUNK_SIZE)
+    for line_number, line in enumerate(lines, start=1):
+        importer.add_line(line_number, line)
+        if importer.ready:
+            await _flush(db, importer)
+    await _flush(db, importer)
+    return importer.result()
+
+
+def _too_large(detail: str, importer: Optional[PostImporter] = None) -> HTTPException:
+    if importer is not None and importer.inserted:
+        detail += f"; {importer.inserted} posts from earlier lines were already imported"
+    return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+
+
+async def import_posts_stream_async(
+    db: DBSession,
+    stream: AsyncIterable[bytes],
+    user_id: int,
+    content_length: Optional[int] = None
+) -> dict:
+    """Import an NDJSON request body as it arrives, holding at most one chunk of lines in memory.
+
+    Chunks are committed as they fill, so a body that turns out too large is
+    refused with a 413 after the chunks before it have landed.
+    """
+    body_limit = f"Import body exceeds the {settings.BULK_IMPORT_MAX_BYTES} byte limit"
+    if content_length is not None and content_length > settings.BULK_IMPORT_MAX_BYTES:
+        raise _too_large(body_limit)
+
+    # End whatever transaction authentication opened: the body may take minutes to
+    # arrive, and the first chunk must not commit in a transaction begun before it
+    await run_db(db, Session.rollback)
+
+    importer = PostImporter(user_id)
+    line_number = 0
+    size = 0
+    partial = bytearray()
+    try:
+        async for data in stream:
+            size += len(data)
+            if size > settings.BULK_IMPORT_MAX_BYTES:
+                raise _too_large(body_limit, importer)
+            # Only the new bytes are searched; a line's earlier pieces wait in `partial`
+            start = 0
+            while True:
+                end = data.find(b"\n", start)
+                piece = data[start:] if end == -1 else data[start:end]
+                if len(partial) + len(piece) > settings.BULK_IMPORT_MAX_LINE_BYTES:
+                    raise _too_large(
+                        f"Line {line_number + 1} exceeds the {settings.BULK_IMPORT_MAX_LINE_BYTES} byte line limit",
+                        importer
+                    )
+                partial += piece
+                if end == -1:
+                    break
+                line_number += 1
+                importer.add_line(line_number, partial.decode("utf-8", errors="replace"))
+                partial.clear()
+                if importer.ready:
+                    await _flush(db, importer)
+                start = end + 1
+        if partial:
+            importer.add_line(line_number + 1, partial.decode("utf-8", errors="replace"))
+        await _flush(db, importer)
+    finally:
+        for image_url in importer.image_urls:
+            derivative_pipeline.enqueue(image_url)
+    return importer.result()
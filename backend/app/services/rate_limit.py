@@ -0,0 +1,129 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from app.config import settings
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger("app.rate_limit")
+
+
+def parse_costs(spec: str) -> Dict[Tuple[str, str, Optional[str]], int]:
+    """Parse RATE_LIMIT_COSTS: comma-separated `METHOD /path[?param]=cost` rules.
+
+    A rule with `?param` applies only when that query parameter is present,
+    e.g. `GET /api/blogs/?search=5` prices searches above plain listings.
+    """
+    costs = {}
+    for rule in spec.split(","):
+        rule = rule.strip()
+        if not rule:
+            continue
+        target, _, cost = rule.rpartition("=")
+        method, _, path = target.strip().partition(" ")
+        path, _, param = path.strip().partition("?")
+        costs[(method.upper(), path, param or None)] = int(cost)
+    return costs
+
+
+_costs = parse_costs(settings.RATE_LIMIT_COSTS)
+
+
+def request_cost(method: str, path: str, query_params: Dict[str, str]) -> int:
+    """Tokens a request takes: the most expensive matching rule, 1 when none matches"""
+    cost = _costs.get((method, path, None), 1)
+    for (rule_method, rule_path, param), rule_cost in _costs.items():
+        if param and rule_method == method and rule_path == path and query_params.get(param):
+            cost = max(cost, rule_cost)
+    return cost
+
+
+class RateLimitBackend:
+    """Token buckets: `take` spends `cost` tokens from a key's bucket"""
+
+    async def take(self, key: str, cost: int, rate: float, burst: int) -> float:
+        """Spend the tokens and return 0, or return the seconds until they would be available"""
+        raise NotImplementedError
+
+
+class NullRateLimitBackend(RateLimitBackend):
+    """Admits everything"""
+
+    async def take(self, key, cost, rate, burst):
+        return 0.0
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Per-process buckets; a bucket left alone until it would be full again is simply forgotten"""
+
+    def __init__(self, max_keys: int):
+        self._buckets = TTLCache(max_entries=max_keys)
+        self._lock = threading.Lock()
+
+    async def take(self, key, cost, rate, burst):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            wait = 0.0 if tokens >= cost else (cost - tokens) / rate
+            if not wait:
+                tokens -= cost
+            self._buckets.set(key, (tokens, now), ttl=(burst - tokens) / rate)
+        return wait
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Buckets shared by every worker and host, updated atomically by a Lua script"""
+
+    PREFIX = "blogi:ratelimit:"
+
+    # Uses the server clock, so hosts with skewed clocks still agree
+    SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or burst
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil((burst - tokens) / rate) + 1)
+return tostring(wait)
+"""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._script = self._redis.register_script(self.SCRIPT)
+
+    async def take(self, key, cost, rate, burst):
+        try:
+            return float(await self._script(keys=[self.PREFIX + key], args=[rate, burst, cost]))
+        except Exception:
+            # Limiting is best effort: an unreachable Redis must not take the API down with it
+            logger.warning("Rate limit backend unavailable; admitting request", exc_info=True)
+            return 0.0
+
+
+_backend: Optional[RateLimitBackend] = None
+
+
+def get_rate_limiter() -> RateLimitBackend:
+    global _backend
+    if _backend is None:
+        if settings.RATE_LIMIT_BACKEND == "redis":
+            _backend = RedisRateLimitBackend(settings.REDIS_URL)
+        elif settings.RATE_LIMIT_BACKEND == "memory":
+            _backend = MemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS)
+        else:
+            _backend = NullRateLimitBackend()
+    return _backend
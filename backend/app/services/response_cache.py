@@ -0,0 +1,210 @@
+import json
+import time
+from typing import Optional
+from app.config import settings
+from app.utils.cache import TTLCache
+
+
+class CachedResponse:
+    """A rendered response body with its validators"""
+
+    def __init__(self, body: bytes, etag: str, last_modified: Optional[str]):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def dumps(self) -> str:
+        return json.dumps({"body": self.body.decode(), "etag": self.etag, "last_modified": self.last_modified})
+
+    @classmethod
+    def loads(cls, raw) -> "CachedResponse":
+        data = json.loads(raw)
+        return cls(data["body"].encode(), data["etag"], data["last_modified"])
+
+
+class ResponseCacheBackend:
+    """Storage for cached responses, a counter that versions every listing key and per-post versions"""
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: CachedResponse) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def listing_generation(self) -> int:
+        raise NotImplementedError
+
+    async def bump_listing_generation(self) -> int:
+        """Advance the listing generation and return the new value"""
+        raise NotImplementedError
+
+    async def seconds_since_bump(self) -> float:
+        """How long ago the listing generation last moved"""
+        raise NotImplementedError
+
+    async def post_version(self, post_id: int) -> int:
+        raise NotImplementedError
+
+    async def set_post_version(self, post_id: int, version: int) -> None:
+        raise NotImplementedError
+
+
+class NullCacheBackend(ResponseCacheBackend):
+    """Caches nothing; responses still carry ETag/Last-Modified"""
+
+    async def get(self, key):
+        return None
+
+    async def set(self, key, value):
+        pass
+
+    async def delete(self, key):
+        pass
+
+    async def listing_generation(self):
+        return 0
+
+    async def bump_listing_generation(self):
+        return 0
+
+    async def seconds_since_bump(self):
+        return float("inf")
+
+    async def post_version(self, post_id):
+        return 0
+
+    async def set_post_version(self, post_id, version):
+        pass
+
+
+class MemoryCacheBackend(ResponseCacheBackend):
+    """Per-process LRU with TTL"""
+
+    def __init__(self, max_entries: int, ttl: int):
+        self._cache = TTLCache(max_entries=max_entries, ttl=ttl)
+        self._generation = 0
+        self._bumped_at = 0.0
+        # Not evicted with the LRU: a forgotten version would revive entries stored before it
+        self._post_versions = {}
+
+    async def get(self, key):
+        return self._cache.get(key)
+
+    async def set(self, key, value):
+        self._cache.set(key, value)
+
+    async def delete(self, key):
+        self._cache.delete(key)
+
+    async def listing_generation(self):
+        return self._generation
+
+    async def bump_listing_generation(self):
+        # Old-generation entries are never read again and age out of the LRU
+        self._generation += 1
+        self._bumped_at = time.time()
+        return self._generation
+
+    async def seconds_since_bump(self):
+        return time.time() - self._bumped_at
+
+    async def post_version(self, post_id):
+        return self._post_versions.get(post_id, 0)
+
+    async def set_post_version(self, post_id, version):
+        self._post_versions[post_id] = version
+
+
+class RedisCacheBackend(ResponseCacheBackend):
+    """Shared cache for all workers and hosts, so one worker's write invalidates everyone's copies"""
+
+    PREFIX = "blogi:response:"
+
+    def __init__(self, url: str, ttl: int):
+        import redis.asyncio as redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._ttl = ttl
+
+    async def get(self, key):
+        raw = await self._redis.get(self.PREFIX + key)
+        return CachedResponse.loads(raw) if raw is not None else None
+
+    async def set(self, key, value):
+        await self._redis.set(self.PREFIX + key, value.dumps(), ex=self._ttl)
+
+    async def delete(self, key):
+        await self._redis.delete(self.PREFIX + key)
+
+    async def listing_generation(self):
+        return int(await self._redis.get(self.PREFIX + "generation") or 0)
+
+    async def bump_listing_generation(self):
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.incr(self.PREFIX + "generation")
+            pipe.set(self.PREFIX + "generation_at", time.time())
+            generation, _ = await pipe.execute()
+        return generation
+
+    async def seconds_since_bump(self):
+        return time.time() - float(await self._redis.get(self.PREFIX + "generation_at") or 0)
+
+    async def post_version(self, post_id):
+        return int(await self._redis.get(f"{self.PREFIX}post_version:{post_id}") or 0)
+
+    async def set_post_version(self, post_id, version):
+        # Outlives whatever was stored under the old version, so that version never comes back
+        await self._redis.set(f"{self.PREFIX}post_version:{post_id}", version, ex=self._ttl * 2)
+
+
+_backend: Optional[ResponseCacheBackend] = None
+
+
+def get_response_cache() -> ResponseCacheBackend:
+    global _backend
+    if _backend is None:
+        if settings.RESPONSE_CACHE_BACKEND == "redis":
+            _backend = RedisCacheBackend(settings.REDIS_URL, settings.RESPONSE_CACHE_TTL_SECONDS)
+        elif settings.RESPONSE_CACHE_BACKEND == "memory":
+            _backend = MemoryCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TTL_SECONDS)
+        else:
+            _backend = NullCacheBackend()
+    return _backend
+
+
+async def post_cache_key(post_id: int) -> str:
+    """Key for a single post, versioned by the last change to that post.
+
+    A read that loaded the post before a change committed stores its copy under
+    the old version, where no later read looks, instead of putting it back
+    after the invalidation.
+    """
+    version = await get_response_cache().post_version(post_id)
+    return f"post:{post_id}:{version}"
+
+
+async def listing_cache_key(**params) -> str:
+    """Key for a public listing page; includes the listing generation so one bump invalidates every page"""
+    generation = await get_response_cache().listing_generation()
+    parts = ":".join(f"{name}={'' if value is None else value}" for name, value in sorted(params.items()))
+    return f"list:{generation}:{parts}"
+
+
+async def invalidate_listings() -> int:
+    """Invalidate every listing page; returns the new listing generation"""
+    return await get_response_cache().bump_listing_generation()
+
+
+async def invalidate_post(post_id: int) -> int:
+    """Invalidate one post's cached response and every listing page, any of which may show it.
+
+    Other posts' cached responses stay valid. Returns the new listing generation.
+    """
+    cache = get_response_cache()
+    generation = await cache.bump_listing_generation()
+    # Generations only grow, so the post never returns to a version it had before
+    await cache.set_post_version(post_id, generation)
+    return generation
@@ -0,0 +1,293 @@
+import heapq
+import re
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy import func, literal_column, or_
+from sqlalchemy.orm import Session
+from app.models.post import Post
+from app.config import settings
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_CLAUSE_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+
+class SearchClause:
+    """One clause of a parsed search: a single (optionally prefix) term or a quoted phrase"""
+
+    def __init__(self, terms: List[str], prefix: bool = False):
+        self.terms = terms
+        self.prefix = prefix
+
+    @property
+    def is_phrase(self) -> bool:
+        return len(self.terms) > 1
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def parse_search(search: str) -> List[SearchClause]:
+    """Parse a search string into clauses that must all match.
+
+    `"exact phrase"` matches the words in order, `term*` matches any word
+    starting with `term`, and everything else matches whole words.
+    """
+    clauses = []
+    for phrase, word in _CLAUSE_RE.findall(search):
+        if phrase:
+            terms = tokenize(phrase)
+            if terms:
+                clauses.append(SearchClause(terms))
+            continue
+        terms = tokenize(word)
+        for i, term in enumerate(terms):
+            # Only the last word of `foo-bar*` is a prefix
+            clauses.append(SearchClause([term], prefix=word.endswith("*") and i == len(terms) - 1))
+    return clauses
+
+
+class SearchBackend:
+    """Base class for post search backends.
+
+    `apply` narrows a listing query to matching posts and returns the ranking
+    expression to order by (or None when the backend does not rank). Backends
+    that rank in process implement `page` instead and hand back just one page of ids.
+    """
+
+    name = "base"
+
+    def apply(self, db: Session, query, search: str):
+        raise NotImplementedError
+
+    def page(
+        self, db: Session, search: str, user_id: Optional[int], skip: int, limit: int
+    ) -> Optional[Tuple[List[int], int]]:
+        """Ids of one page of ranked matches, best first, and the number of matches; None to use `apply`"""
+        return None
+
+    def index_post(self, post_id: int, title: str, content: str, user_id: int, created_at: datetime) -> None:
+        """Called after a post is created or updated"""
+
+    def remove_post(self, post_id: int) -> None:
+        """Called after a post is deleted"""
+
+
+class PostgresSearchBackend(SearchBackend):
+    """Full-text search over the generated, GIN-indexed `posts.search_vector` column"""
+
+    name = "postgres"
+
+    def __init__(self):
+        # The PostgreSQL dialect loads with the backend, not with the app
+        from sqlalchemy.dialects.postgresql import TSVECTOR
+        self.search_vector = literal_column("posts.search_vector", type_=TSVECTOR)
+
+    @staticmethod
+    def to_tsquery(clauses: List[SearchClause]) -> str:
+        parts = []
+        for clause in clauses:
+            if clause.is_phrase:
+                parts.append("(" + " <-> ".join(clause.terms) + ")")
+            else:
+                parts.append(clause.terms[0] + (":*" if clause.prefix else ""))
+        return " & ".join(parts)
+
+    def apply(self, db: Session, query, search: str):
+        clauses = parse_search(search)
+        if not clauses:
+            return query, None
+        tsquery = func.to_tsquery(settings.SEARCH_LANGUAGE, self.to_tsquery(clauses))
+        query = query.filter(self.search_vector.op("@@")(tsquery))
+        return query, func.ts_rank_cd(self.search_vector, tsquery)
+
+
+class LikeSearchBackend(SearchBackend):
+    """Legacy substring matching with ILIKE; unindexed, kept for databases without the search migration"""
+
+    name = "ilike"
+
+    def apply(self, db: Session, query, search: str):
+        search_term = f"%{search}%"
+        query = query.filter(
+            or_(
+                Post.title.ilike(search_term),
+                Post.content.ilike(search_term)
+            )
+        )
+        return query, None
+
+
+class InMemorySearchBackend(SearchBackend):
+    """In-process inverted index with positional postings, for SQLite and test runs.
+
+    The index is built from the database on first use and then kept current
+    through `index_post`/`remove_post`, so it only sees writes made by this process.
+    """
+
+    name = "memory"
+    TITLE_WEIGHT = 2
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        # token -> post id -> positions of the token in that post
+        self._postings: Dict[str, Dict[int, List[int]]] = {}
+        # post id -> tokens present in that post, for removal
+        self._documents: Dict[int, Set[str]] = {}
+        # title tokens per post, used for ranking
+        self._titles: Dict[int, Set[str]] = {}
+        # sorted vocabulary for prefix lookups
+        self._vocabulary: List[str] = []
+        # post id -> (author, created_at), to filter by author and order ties without the database
+        self._meta: Dict[int, Tuple[int, datetime]] = {}
+
+    def _build(self, db: Session) -> None:
+        if self._built:
+            return
+        # Read outside the lock: under AsyncSession.run_sync the query yields to the event loop
+        rows = db.query(Post.id, Post.title, Post.content, Post.user_id, Post.created_at).all()
+        with self._lock:
+            if self._built:
+                return
+            for post_id, title, content, user_id, created_at in rows:
+                self._add(post_id, title, content, user_id, created_at)
+            self._built = True
+
+    def _add(self, post_id: int, title: str, content: str, user_id: int, created_at: datetime) -> None:
+        title_tokens = tokenize(title or "")
+        tokens = title_tokens + tokenize(content or "")
+        for position, token in enumerate(tokens):
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                insort(self._vocabulary, token)
+            postings.setdefault(post_id, []).append(position)
+        self._documents[post_id] = set(tokens)
+        self._titles[post_id] = set(title_tokens)
+        self._meta[post_id] = (user_id, created_at)
+
+    def _remove(self, post_id: int) -> None:
+        for token in self._documents.pop(post_id, ()):
+            postings = self._postings[token]
+            postings.pop(post_id, None)
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+        self._titles.pop(post_id, None)
+        self._meta.pop(post_id, None)
+
+    def index_post(self, post_id, title, content, user_id, created_at):
+        with self._lock:
+            if self._built:
+                self._remove(post_id)
+                self._add(post_id, title, content, user_id, created_at)
+
+    def remove_post(self, post_id: int) -> None:
+        with self._lock:
+            if self._built:
+                self._remove(post_id)
+
+    def _expand(self, clause: SearchClause) -> List[str]:
+        term = clause.terms[0]
+        if not clause.prefix:
+            return [term] if term in self._postings else []
+        start = bisect_left(self._vocabulary, term)
+        matches = []
+        for token in self._vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            matches.append(token)
+        return matches
+
+    def _match_clause(self, clause: SearchClause) -> Dict[int, float]:
+        """Return {post_id: score} for posts matching one clause"""
+        scores: Dict[int, float] = {}
+        if not clause.is_phrase:
+            for token in self._expand(clause):
+                for post_id, positions in self._postings[token].items():
+                    weight = self.TITLE_WEIGHT if token in self._titles.get(post_id, ()) else 1
+                    scores[post_id] = scores.get(post_id, 0) + len(positions) * weight
+            return scores
+
+        postings = [self._postings.get(term) for term in clause.terms]
+        if not all(postings):
+            return scores
+        candidates = set.intersection(*(set(p) for p in postings))
+        for post_id in candidates:
+            following = [set(p[post_id]) for p in postings[1:]]
+            hits = sum(
+                1 for start in postings[0][post_id]
+                if all(start + offset + 1 in positions for offset, positions in enumerate(following))
+            )
+            if hits:
+                scores[post_id] = hits * len(clause.terms)
+        return scores
+
+    def _scores(self, clauses: List[SearchClause]) -> Dict[int, float]:
+        """{post_id: score} for posts matching every clause; the caller holds the lock"""
+        scores: Optional[Dict[int, float]] = None
+        for clause in clauses:
+            matched = self._match_clause(clause)
+            if scores is None:
+                scores = matched
+            else:
+                scores = {post_id: scores[post_id] + score for post_id, score in matched.items() if post_id in scores}
+            if not scores:
+                return {}
+        return scores or {}
+
+    def search(self, db: Session, search: str) -> List[Tuple[int, float]]:
+        """Return (post_id, score) pairs for posts matching every clause"""
+        self._build(db)
+        clauses = parse_search(search)
+        if not clauses:
+            return []
+        with self._lock:
+            return list(self._scores(clauses).items())
+
+    def apply(self, db, query, search):
+        # Only reached when `page` declines: a search with no terms, which matches everything
+        return query, None
+
+    def page(self, db, search, user_id, skip, limit):
+        """Rank and page here, in score then (created_at, id) order, newest first among equals.
+
+        Binding every match into the listing query would grow the statement with
+        the number of matches (and can exceed SQLite's bound-parameter limit).
+        """
+        clauses = parse_search(search)
+        if not clauses:
+            return None
+        self._build(db)
+        # Match, filter and rank under one hold, so a post removed meanwhile cannot be half-seen
+        with self._lock:
+            matches = [
+                (post_id, score) for post_id, score in self._scores(clauses).items()
+                if user_id is None or self._meta[post_id][0] == user_id
+            ]
+            ranked = heapq.nlargest(
+                skip + limit, matches, key=lambda match: (match[1], self._meta[match[0]][1], match[0])
+            )
+        return [post_id for post_id, _ in ranked[skip:]], len(matches)
+
+_BACKENDS = {
+    PostgresSearchBackend.name: PostgresSearchBackend,
+    LikeSearchBackend.name: LikeSearchBackend,
+    InMemorySearchBackend.name: InMemorySearchBackend,
+}
+
+_backend: Optional[SearchBackend] = None
+
+
+def get_search_backend() -> SearchBackend:
+    """Return the configured search backend; `auto` picks PostgreSQL full-text search or the in-memory index"""
+    global _backend
+    if _backend is None:
+        name = settings.SEARCH_BACKEND
+        if name == "auto":
+            name = "postgres" if settings.DATABASE_URL.startswith("postgresql") else "memory"
+        _backend = _BACKENDS[name]()
+    return _backend
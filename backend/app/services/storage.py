@@ -0,0 +1,209 @@
+import os
+import uuid
+from typing import List, Optional
+from app.config import settings
+
+
+class StorageWriter:
+    """Incremental write of one object; nothing is visible under the key until `complete`"""
+
+    def write(self, data: bytes) -> None:
+        raise NotImplementedError
+
+    def complete(self) -> None:
+        raise NotImplementedError
+
+    def abort(self) -> None:
+        raise NotImplementedError
+
+
+class StorageBackend:
+    """Object storage for uploads and their derivatives, addressed by key (e.g. `uploads/<uuid>.jpg`)"""
+
+    def get_bytes(self, key: str) -> bytes:
+        raise NotImplementedError
+
+    def put_bytes(self, key: str, data: bytes, content_type: str) -> None:
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def open_writer(self, key: str, content_type: str) -> StorageWriter:
+        raise NotImplementedError
+
+    def url_for(self, key: str) -> str:
+        """Public URL of a stored object"""
+        raise NotImplementedError
+
+    def key_for_url(self, url: str) -> Optional[str]:
+        """Key of one of our objects given its public URL, or None for foreign URLs"""
+        prefix = self.url_for("")
+        return url[len(prefix):] if url.startswith(prefix) and len(url) > len(prefix) else None
+
+
+class S3MultipartWriter(StorageWriter):
+    """Buffers at most one part in memory and ships it with UploadPart"""
+
+    def __init__(self, client, bucket: str, key: str, content_type: str, part_size: int):
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self._buffer = bytearray()
+        self._parts: List[dict] = []
+        self._upload_id = client.create_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            ContentType=content_type,
+            CacheControl="public, max-age=31536000, immutable"
+        )["UploadId"]
+
+    def _upload_part(self, data: bytes) -> None:
+        part_number = len(self._parts) + 1
+        response = self.client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=data
+        )
+        self._parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+
+    def write(self, data):
+        self._buffer += data
+        while len(self._buffer) >= self.part_size:
+            self._upload_part(bytes(self._buffer[:self.part_size]))
+            del self._buffer[:self.part_size]
+
+    def complete(self):
+        # The last part may be smaller than the S3 minimum; an empty upload still needs one part
+        if self._buffer or not self._parts:
+            self._upload_part(bytes(self._buffer))
+            self._buffer.clear()
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            MultipartUpload={"Parts": self._parts}
+        )
+
+    def abort(self):
+        self._buffer.clear()
+        self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self._upload_id)
+
+
+class S3StorageBackend(StorageBackend):
+
+    def __init__(self, bucket: str):
+        self.bucket = bucket
+
+    @property
+    def client(self):
+        from app.services.upload import get_s3_client
+
+        return get_s3_client()
+
+    def get_bytes(self, key):
+        return self.client.get_object(Bucket=self.bucket, Key=key)["Body"].read()
+
+    def put_bytes(self, key, data, content_type):
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=data,
+            ContentType=content_type,
+            CacheControl="public, max-age=31536000, immutable"
+        )
+
+    def exists(self, key):
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def open_writer(self, key, content_type):
+        return S3MultipartWriter(self.client, self.bucket, key, content_type, settings.UPLOAD_S3_PART_SIZE)
+
+    def url_for(self, key):
+        from app.services.upload import public_file_url
+
+        return public_file_url(key)
+
+
+class LocalFileWriter(StorageWriter):
+    """Appends to a hidden temporary file that is renamed into place on completion"""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._tmp_path = f"{path}.{uuid.uuid4().hex}.part"
+        self._file = open(self._tmp_path, "wb")
+
+    def write(self, data):
+        self._file.write(data)
+
+    def complete(self):
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        self._file.close()
+        try:
+            os.remove(self._tmp_path)
+        except FileNotFoundError:
+            pass
+
+
+class LocalStorageBackend(StorageBackend):
+    """Files under LOCAL_STORAGE_DIR, served by the app (or nginx) under LOCAL_STORAGE_URL"""
+
+    def __init__(self, root: str, base_url: str):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip("/")
+
+    def path_for(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, key))
+        if os.path.commonpath([path, self.root]) != self.root:
+            raise ValueError(f"Key escapes the storage root: {key}")
+        return path
+
+    def get_bytes(self, key):
+        with open(self.path_for(key), "rb") as f:
+            return f.read()
+
+    def put_bytes(self, key, data, content_type):
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so readers never see a partial file
+        tmp_path = f"{path}.part"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def exists(self, key):
+        return os.path.exists(self.path_for(key))
+
+    def open_writer(self, key, content_type):
+        return LocalFileWriter(self.path_for(key))
+
+    def url_for(self, key):
+        return f"{self.base_url}/{key}"
+
+
+_storage: Optional[StorageBackend] = None
+
+
+def get_storage() -> StorageBackend:
+    global _storage
+    if _storage is None:
+        if settings.STORAGE_BACKEND == "local":
+            _storage = LocalStorageBackend(settings.LOCAL_STORAGE_DIR, settings.LOCAL_STORAGE_URL)
+        else:
+            _storage = S3StorageBackend(settings.AWS_S3_BUCKET_NAME)
+    return _storage
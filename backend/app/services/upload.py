@@ -1,47 +1,225 @@
-import boto3
+import hashlib
+import threading
 import uuid
-from botocore.exceptions import ClientError
+from typing import AsyncIterable, List, Optional
 from app.config import settings
 from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
 from app.schemas.upload import PresignedUrlRequest, PresignedUrlResponse
 
+_s3_client = None
+_s3_client_key = None
+_s3_client_lock = threading.Lock()
+
+def _s3_client_settings() -> tuple:
+    return (
+        settings.AWS_ACCESS_KEY_ID,
+        settings.AWS_SECRET_ACCESS_KEY,
+        settings.AWS_REGION,
+        settings.AWS_S3_ENDPOINT_URL
+    )
+
+def get_s3_client():
+    """
+    Return the process-wide S3 client, building it on first use and rebuilding
+    it whenever the configured credentials, region or endpoint change.
+    boto3 clients are thread-safe, so one client serves every request.
+    """
+    global _s3_client, _s3_client_key
+    key = _s3_client_settings()
+    if _s3_client is not None and _s3_client_key == key:
+        return _s3_client
+
+    with _s3_client_lock:
+        if _s3_client is None or _s3_client_key != key:
+            import boto3
+            from botocore.config import Config
+
+            access_key, secret_key, region, endpoint_url = key
+            # Empty keys fall through to boto3's default credential chain
+            _s3_client = boto3.client(
+                's3',
+                aws_access_key_id=access_key or None,
+                aws_secret_access_key=secret_key or None,
+                region_name=region,
+                endpoint_url=endpoint_url or None,
+                config=Config(max_pool_connections=settings.AWS_S3_MAX_POOL_CONNECTIONS)
+            )
+            _s3_client_key = key
+        return _s3_client
+
+def reset_s3_client():
+    """Drop the cached client, e.g. after rotating credentials"""
+    global _s3_client, _s3_client_key
+    with _s3_client_lock:
+        _s3_client = None
+        _s3_client_key = None
+
+def public_file_url(key: str) -> str:
+    """The URL where an uploaded object will be accessible"""
+    if settings.AWS_S3_ENDPOINT_URL:
+        return f"{settings.AWS_S3_ENDPOINT_URL.rstrip('/')}/{settings.AWS_S3_BUCKET_NAME}/{key}"
+    return f"https://{settings.AWS_S3_BUCKET_NAME}.s3.{settings.AWS_REGION}.amazonaws.com/{key}"
+
+def _presign(s3_client, request: PresignedUrlRequest) -> PresignedUrlResponse:
+    # Generate a unique file name to prevent overwriting
+    file_extension = request.file_name.split('.')[-1]
+    unique_filename = f"uploads/{uuid.uuid4()}.{file_extension}"
+
+    # Generate the presigned URL for upload
+    presigned_url = s3_client.generate_presigned_url(
+        'put_object',
+        Params={
+            'Bucket': settings.AWS_S3_BUCKET_NAME,
+            'Key': unique_filename,
+            'ContentType': "image/jpg"
+        },
+        ExpiresIn=3600  # URL expires in 1 hour
+    )
+
+    return PresignedUrlResponse(
+        upload_url=presigned_url,
+        file_url=public_file_url(unique_filename)
+    )
+
 def generate_presigned_upload_url(request: PresignedUrlRequest) -> PresignedUrlResponse:
     """
     Generate a presigned URL for uploading a file to S3
     """
+    from botocore.exceptions import ClientError
+
     try:
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
-        
-        # Generate a unique file name to prevent overwriting
-        file_extension = request.file_name.split('.')[-1]
-        unique_filename = f"uploads/{uuid.uuid4()}.{file_extension}"
-        
-        # Generate the presigned URL for upload
-        presigned_url = s3_client.generate_presigned_url(
-            'put_object',
-            Params={
-                'Bucket': settings.AWS_S3_BUCKET_NAME,
-                'Key': unique_filename,
-                'ContentType': "image/jpg"
-            },
-            ExpiresIn=3600  # URL expires in 1 hour
-        )
-        
-        # The URL where the file will be accessible after upload
-        file_url = f"https://{settings.AWS_S3_BUCKET_NAME}.s3.{settings.AWS_REGION}.amazonaws.com/{unique_filename}"
-        
-        return PresignedUrlResponse(
-            upload_url=presigned_url,
-            file_url=file_url
+        return _presign(get_s3_client(), request)
+
+    except ClientError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error generating presigned URL: {str(e)}"
         )
-    
+
+def generate_presigned_upload_urls(requests: List[PresignedUrlRequest]) -> List[PresignedUrlResponse]:
+    """
+    Generate presigned upload URLs for several files with one client
+    """
+    from botocore.exceptions import ClientError
+
+    try:
+        s3_client = get_s3_client()
+        return [_presign(s3_client, request) for request in requests]
+
     except ClientError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error generating presigned URL: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+def complete_upload(file_url: str) -> dict:
+    """
+    Confirm that a presigned upload landed and hand it to the derivative pipeline
+    """
+    from app.services.images import derivative_pipeline
+    from app.services.storage import get_storage
+
+    storage = get_storage()
+    key = storage.key_for_url(file_url)
+    if key is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File URL does not belong to this service"
+        )
+    if not storage.exists(key):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Uploaded file not found"
+        )
+    return {"file_url": file_url, "queued": derivative_pipeline.enqueue(file_url)}
+
+# Leading bytes of the image formats we accept, with their MIME type and extension
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png", "png"),
+    (b"GIF87a", "image/gif", "gif"),
+    (b"GIF89a", "image/gif", "gif"),
+)
+_SNIFF_BYTES = 12
+
+def sniff_image_type(head: bytes) -> Optional[tuple]:
+    """(MIME type, extension) of an image from its first bytes, or None if unsupported"""
+    for signature, content_type, extension in _SIGNATURES:
+        if head.startswith(signature):
+            return content_type, extension
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp", "webp"
+    return None
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File exceeds the {settings.UPLOAD_MAX_BYTES} byte upload limit"
+    )
+
+async def stream_upload_async(stream: AsyncIterable[bytes], content_length: Optional[int] = None) -> dict:
+    """
+    Write a raw request body to storage as it arrives, hashing and sniffing it on the fly.
+    Memory use is bounded by UPLOAD_CHUNK_SIZE (plus one S3 part) whatever the file size.
+    """
+    from app.services.images import derivative_pipeline
+    from app.services.storage import get_storage
+
+    if content_length is not None and content_length > settings.UPLOAD_MAX_BYTES:
+        raise _too_large()
+
+    storage = get_storage()
+    digest = hashlib.sha256()
+    buffer = bytearray()
+    size = 0
+    writer = None
+    key = content_type = None
+    try:
+        async for data in stream:
+            size += len(data)
+            if size > settings.UPLOAD_MAX_BYTES:
+                raise _too_large()
+            digest.update(data)
+            buffer += data
+
+            if writer is None:
+                if len(buffer) < _SNIFF_BYTES:
+                    continue
+                sniffed = sniff_image_type(bytes(buffer[:_SNIFF_BYTES]))
+                if sniffed is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                        detail="Only JPEG, PNG, GIF and WebP images can be uploaded"
+                    )
+                content_type, extension = sniffed
+                key = f"uploads/{uuid.uuid4()}.{extension}"
+                writer = await run_in_threadpool(storage.open_writer, key, content_type)
+
+            # Hand storage fixed-size chunks so small network reads don't each cost a thread hop
+            if len(buffer) >= settings.UPLOAD_CHUNK_SIZE:
+                chunk, buffer = bytes(buffer), bytearray()
+                await run_in_threadpool(writer.write, chunk)
+
+        if writer is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Upload is empty or too short to be an image"
+            )
+        if buffer:
+            await run_in_threadpool(writer.write, bytes(buffer))
+        await run_in_threadpool(writer.complete)
+    except Exception:
+        # Includes client disconnects: never leave partial objects behind
+        if writer is not None:
+            await run_in_threadpool(writer.abort)
+        raise
+
+    file_url = storage.url_for(key)
+    return {
+        "file_url": file_url,
+        "content_type": content_type,
+        "size": size,
+        "sha256": digest.hexdigest(),
+        "queued": derivative_pipeline.enqueue(file_url)
+    }
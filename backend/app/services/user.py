@@ -0,0 +1,82 @@
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+from app.database import DBSession, run_db
+from app.models.post import Post
+from app.models.user import User
+
+
+def _author_post_count(user_id):
+    return select(func.count(Post.id)).where(Post.user_id == user_id).scalar_subquery()
+
+
+def _author_last_post_at(user_id):
+    # Served by the (user_id, created_at, id) index
+    return select(func.max(Post.created_at)).where(Post.user_id == user_id).scalar_subquery()
+
+
+def adjust_post_counter(db: Session, user_id: int, delta: int) -> None:
+    """Apply a change in an author's post count inside the caller's transaction.
+
+    The increment is atomic in the database, and last_post_at is re-read from
+    the author's posts, so deleting their newest post moves it back.
+    """
+    db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(
+            post_count=User.post_count + delta,
+            last_post_at=_author_last_post_at(user_id),
+            # Stats changes are not profile edits
+            updated_at=User.updated_at
+        )
+    )
+
+
+def repair_post_counters(db: Session, user_id: Optional[int] = None, batch_size: int = 1000) -> int:
+    """Recompute post_count and last_post_at from posts, one batch of user ids per transaction.
+
+    Returns the number of users whose counters were wrong.
+    """
+    count = _author_post_count(User.id)
+    last_post_at = _author_last_post_at(User.id)
+    stale = or_(User.post_count != count, User.last_post_at.is_distinct_from(last_post_at))
+
+    if user_id is not None:
+        bounds = [(user_id, user_id)]
+    else:
+        low, high = db.query(func.min(User.id), func.max(User.id)).one()
+        bounds = [] if low is None else [
+            (start, min(start + batch_size - 1, high)) for start in range(low, high + 1, batch_size)
+        ]
+
+    repaired = 0
+    for start, end in bounds:
+        result = db.execute(
+            update(User)
+            .where(User.id.between(start, end), stale)
+            .values(post_count=count, last_post_at=last_post_at, updated_at=User.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        repaired += result.rowcount
+    return repaired
+
+
+def get_user_stats(db: Session, user_id: int) -> dict:
+    row = (
+        db.query(User.id, User.username, User.created_at, User.post_count, User.last_post_at)
+        .filter(User.id == user_id)
+        .first()
+    )
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    return dict(row._mapping)
+
+
+async def get_user_stats_async(db: DBSession, user_id: int) -> dict:
+    return await run_db(db, get_user_stats, user_id)
@@ -1,33 +1,64 @@
-from passlib.context import CryptContext
-from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from app.config import settings
-from app.database import get_db
+from app.database import DBSession, get_session, run_db
 from app.models.user import User
-from app.schemas.auth import TokenData
+from app.schemas.auth import TokenData, UserPrincipal
+from app.utils.cache import TTLCache
+from app.utils.hashing import hash_password, check_password, hashing_pool
+from app.utils.request_metrics import timed
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+# Async variants run on the dedicated hashing pool and raise 429 when it is saturated
+async def verify_password_async(plain_password, hashed_password):
+    return await hashing_pool.run(check_password, plain_password, hashed_password)
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def get_password_hash_async(password):
+    return await hashing_pool.run(hash_password, password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    from jose import jwt
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+# Principals by user id, for AUTH_USER_LOOKUP=cache
+_principal_cache = TTLCache(
+    max_entries=settings.AUTH_USER_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_USER_CACHE_TTL_SECONDS
+)
+
+def invalidate_user_principal(user_id: int):
+    _principal_cache.delete(user_id)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target):
+    invalidate_user_principal(target.id)
+
+def _get_principal_by_id(db: Session, user_id: int) -> Optional[UserPrincipal]:
+    row = db.query(User.id, User.username).filter(User.id == user_id).first()
+    return UserPrincipal.model_validate(row) if row else None
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: DBSession = Depends(get_session)) -> UserPrincipal:
+    """Resolve the bearer token to a principal according to AUTH_USER_LOOKUP.
+
+    `claims` trusts the signed token outright, `cache` looks the user up at most
+    once per AUTH_USER_CACHE_TTL_SECONDS, and `db` checks the database every time.
+    """
+    with timed("auth"):
+        return await _resolve_principal(token, db)
+
+async def _resolve_principal(token: str, db: DBSession) -> UserPrincipal:
+    # jose pulls in its RSA/EC backends; load it with the first token, not at startup
+    from jose import JWTError, jwt
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -44,7 +75,17 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except JWTError:
         raise credentials_exception
         
-    user = db.query(User).filter(User.id == token_data.user_id).first()
-    if user is None:
+    if settings.AUTH_USER_LOOKUP == "claims":
+        return UserPrincipal(id=token_data.user_id, username=token_data.username)
+
+    if settings.AUTH_USER_LOOKUP == "cache":
+        principal = _principal_cache.get(token_data.user_id)
+        if principal is not None:
+            return principal
+
+    principal = await run_db(db, _get_principal_by_id, token_data.user_id)
+    if principal is None:
         raise credentials_exception
-    return user
\ No newline at end of file
+    if settings.AUTH_USER_LOOKUP == "cache":
+        _principal_cache.set(principal.id, principal)
+    return principal
\ No newline at end of file
@@ -0,0 +1,100 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from app.config import settings
+
+_pwd_context = None
+
+
+def get_pwd_context():
+    """The bcrypt CryptContext, built on first use so passlib stays out of startup"""
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+    return _pwd_context
+
+# Module-level so worker processes can unpickle them by reference
+def hash_password(password: str) -> str:
+    return get_pwd_context().hash(password)
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+class HashingPool:
+    """Bounded process pool for bcrypt, so hashing never holds the GIL of a serving worker.
+
+    At most `max_pending` hashes may be queued or running; beyond that callers
+    get a 429 instead of piling up behind a login burst. With `workers=0` hashing
+    falls back to the threadpool.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn rather than fork: the parent has an event loop and threads running
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many authentication requests, please retry shortly",
+                    headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+                )
+            self._pending += 1
+        try:
+            if self.workers <= 0:
+                return await run_in_threadpool(fn, *args)
+            executor = self._get_executor()
+            try:
+                return await asyncio.wrap_future(executor.submit(fn, *args))
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed) and took the pool with it: start a fresh one and retry once
+                self._discard(executor)
+                return await asyncio.wrap_future(self._get_executor().submit(fn, *args))
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            # Concurrent callers may all see the same broken pool; only the first replaces it
+            if self._executor is not executor:
+                return
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+hashing_pool = HashingPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
@@ -0,0 +1,76 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Optional
+from fastapi import Request, Response, status
+
+
+def make_etag(body: bytes) -> str:
+    """Strong validator for a response body"""
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def validator_etag(*parts) -> str:
+    """Strong validator computed from what a body is rendered from (ids, updated_at values, paging),
+    so it can be checked before the body is serialized"""
+    return '"' + hashlib.sha1(repr(parts).encode()).hexdigest() + '"'
+
+
+def http_date(value: Optional[datetime]) -> Optional[str]:
+    if value is None:
+        return None
+    # SQLite hands back naive datetimes; they are stored in UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def latest(values: Iterable[Optional[datetime]]) -> Optional[datetime]:
+    values = [value if value.tzinfo else value.replace(tzinfo=timezone.utc) for value in values if value]
+    return max(values, default=None)
+
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[str]) -> bool:
+    """Evaluate If-None-Match (weak comparison), falling back to If-Modified-Since"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        return _strip_weak(etag) in {_strip_weak(tag) for tag in if_none_match.split(",")}
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def conditional_json_response(
+    request: Request,
+    body: bytes,
+    etag: str,
+    last_modified: Optional[str],
+    cache_control: str
+) -> Response:
+    """JSON response carrying validators, or an empty 304 when the client's copy is current"""
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified, cache_control)
+    return Response(content=body, media_type="application/json", headers=_validator_headers(etag, last_modified, cache_control))
+
+
+def _validator_headers(etag: str, last_modified: Optional[str], cache_control: str) -> dict:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    return headers
+
+
+def not_modified_response(etag: str, last_modified: Optional[str], cache_control: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_validator_headers(etag, last_modified, cache_control))
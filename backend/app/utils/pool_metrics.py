@@ -0,0 +1,86 @@
+import threading
+import time
+from typing import Dict, List, Optional
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool
+
+
+class PoolMetrics:
+    """Checkout counters and wait times for one engine's connection pool"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool: Optional[Pool] = None
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.checkout_timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_checkout(self, wait: float, overflow: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            if overflow:
+                self.overflow_checkouts += 1
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+
+    def record_timeout(self, wait: float) -> None:
+        with self._lock:
+            self.checkout_timeouts += 1
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+
+    def snapshot(self) -> dict:
+        pool = self.pool
+        size = pool.size() if pool is not None else 0
+        max_overflow = getattr(pool, "_max_overflow", 0) if pool is not None else 0
+        with self._lock:
+            return {
+                "name": self.name,
+                "pool_size": size,
+                "max_overflow": max_overflow,
+                "max_connections": size + max(max_overflow, 0),
+                "checked_out": pool.checkedout() if pool is not None else 0,
+                "checked_in": pool.checkedin() if pool is not None else 0,
+                "overflow": max(pool.overflow(), 0) if pool is not None else 0,
+                "checkouts_total": self.checkouts,
+                "overflow_checkouts_total": self.overflow_checkouts,
+                "checkout_timeouts_total": self.checkout_timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+            }
+
+
+_registry: Dict[str, PoolMetrics] = {}
+
+
+def instrumented_pool_class(base: type, name: str) -> type:
+    """Subclass a QueuePool class so every checkout is timed into the metrics registered as `name`.
+
+    The metrics live on the class, so pools rebuilt by `Pool.recreate()` keep reporting.
+    """
+    metrics = _registry.setdefault(name, PoolMetrics(name))
+
+    def __init__(self, *args, **kwargs):
+        base.__init__(self, *args, **kwargs)
+        metrics.pool = self
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = base._do_get(self)
+        except exc.TimeoutError:
+            metrics.record_timeout(time.perf_counter() - start)
+            raise
+        metrics.record_checkout(time.perf_counter() - start, overflow=self.overflow() > 0)
+        return connection
+
+    return type(f"Instrumented{base.__name__}", (base,), {"__init__": __init__, "_do_get": _do_get})
+
+
+def pool_stats() -> List[dict]:
+    """Snapshot of every instrumented pool"""
+    return [metrics.snapshot() for metrics in _registry.values()]
@@ -0,0 +1,207 @@
+import asyncio
+import itertools
+import logging
+import threading
+from typing import List, Optional
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.config import settings
+from app.database import SessionLocal, async_url, engine_options, get_async_sessionmaker
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger("app.replicas")
+
+# Replay lag in seconds; zero when the replica has applied everything it received
+# (an idle primary would otherwise make the last replay look old)
+_PG_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+_PING_QUERY = text("SELECT 1")
+
+
+class Replica:
+    """One read replica: its engine, session factory and health"""
+
+    def __init__(self, name: str, url: str, is_async: bool):
+        self.name = name
+        self.is_async = is_async
+        self.is_postgres = url.startswith("postgresql")
+        if is_async:
+            url = async_url(url)
+            self.engine = create_async_engine(url, **engine_options(url, name, is_async=True))
+            self.sessionmaker = async_sessionmaker(self.engine, autoflush=False, expire_on_commit=False)
+            sync_engine = self.engine.sync_engine
+        else:
+            self.engine = create_engine(url, **engine_options(url, name))
+            self.sessionmaker = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+            sync_engine = self.engine
+        self.healthy = True
+        self.lag_seconds: Optional[float] = None
+        event.listen(sync_engine, "handle_error", self._on_error)
+
+    def _on_error(self, context) -> None:
+        # A dropped connection takes the replica out of rotation until the next good check
+        if context.is_disconnect and self.healthy:
+            self.mark(False, "connection lost")
+
+    def mark(self, healthy: bool, reason: str = "") -> None:
+        if healthy != self.healthy:
+            if healthy:
+                logger.info("Replica %s back in rotation", self.name)
+            else:
+                logger.warning("Replica %s out of rotation: %s", self.name, reason)
+        self.healthy = healthy
+
+    @property
+    def _probe(self):
+        # Other databases have no replay position to read; answering at all is the check
+        return _PG_LAG_QUERY if self.is_postgres else _PING_QUERY
+
+    def _measure_lag_sync(self):
+        with self.engine.connect() as connection:
+            return connection.execute(self._probe).scalar()
+
+    async def _measure_lag(self) -> float:
+        if self.is_async:
+            async with self.engine.connect() as connection:
+                value = (await connection.execute(self._probe)).scalar()
+        else:
+            value = await run_in_threadpool(self._measure_lag_sync)
+        return float(value or 0) if self.is_postgres else 0.0
+
+    async def check(self) -> bool:
+        try:
+            self.lag_seconds = await asyncio.wait_for(self._measure_lag(), settings.REPLICA_HEALTH_CHECK_SECONDS)
+        except Exception as exc:
+            self.lag_seconds = None
+            self.mark(False, f"health check failed: {exc!r}")
+            return False
+        if self.lag_seconds > settings.REPLICA_MAX_LAG_SECONDS:
+            self.mark(False, f"{self.lag_seconds:.1f}s behind the primary")
+            return False
+        self.mark(True)
+        return True
+
+    async def dispose(self) -> None:
+        if self.is_async:
+            await self.engine.dispose()
+        else:
+            self.engine.dispose()
+
+
+class ReplicaSet:
+    """Round-robin over the healthy replicas, checked in the background every REPLICA_HEALTH_CHECK_SECONDS"""
+
+    def __init__(self, urls: List[str], is_async: bool):
+        self.replicas = [Replica(f"replica_{index}", url, is_async) for index, url in enumerate(urls)]
+        self._order = itertools.cycle(range(len(self.replicas))) if self.replicas else None
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def choose(self) -> Optional[Replica]:
+        """Next healthy replica in turn, or None when reads should go to the primary"""
+        if not self.replicas:
+            return None
+        with self._lock:
+            for _ in range(len(self.replicas)):
+                replica = self.replicas[next(self._order)]
+                if replica.healthy:
+                    return replica
+        return None
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(replica.check() for replica in self.replicas))
+
+    async def _check_forever(self) -> None:
+        while True:
+            await self.check_all()
+            await asyncio.sleep(settings.REPLICA_HEALTH_CHECK_SECONDS)
+
+    def start(self) -> None:
+        if self.replicas and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._check_forever())
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for replica in self.replicas:
+            await replica.dispose()
+
+    def status(self) -> List[dict]:
+        return [
+            {"name": replica.name, "healthy": replica.healthy, "lag_seconds": replica.lag_seconds}
+            for replica in self.replicas
+        ]
+
+
+replica_set = ReplicaSet(
+    [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()],
+    is_async=settings.DB_MODE == "async"
+)
+
+# Users who wrote within the last READ_YOUR_WRITES_SECONDS
+_recent_writers = TTLCache(
+    max_entries=settings.READ_YOUR_WRITES_MAX_USERS,
+    ttl=settings.READ_YOUR_WRITES_SECONDS
+)
+
+
+def mark_recent_write(user_id: int) -> None:
+    """Route this user's reads to the primary until replicas have caught up with their write"""
+    if replica_set.replicas:
+        _recent_writers.set(user_id, True)
+
+
+def wrote_recently(request: Request) -> bool:
+    """Whether the request's bearer is inside their read-your-writes window"""
+    if not replica_set.replicas:
+        return False
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    from jose import JWTError, jwt
+    try:
+        # Only picks the primary over a replica, so the signature need not be checked here
+        user_id = jwt.get_unverified_claims(token).get("id")
+    except JWTError:
+        return False
+    return user_id is not None and _recent_writers.get(user_id) is not None
+
+
+def _read_replica(request: Request) -> Optional[Replica]:
+    if wrote_recently(request):
+        return None
+    return replica_set.choose()
+
+
+def get_read_db(request: Request):
+    """Session for read-only endpoints: a healthy replica, or the primary"""
+    replica = _read_replica(request)
+    request.state.replica = replica
+    db = replica.sessionmaker() if replica else SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    replica = _read_replica(request)
+    request.state.replica = replica
+    factory = replica.sessionmaker if replica else get_async_sessionmaker()
+    async with factory() as db:
+        yield db
+
+
+def read_from_replica(request: Request) -> bool:
+    """Whether this request's read session is on a replica"""
+    return getattr(request.state, "replica", None) is not None
+
+
+# Read-session dependency for the configured DB_MODE
+get_read_session = get_async_read_db if settings.DB_MODE == "async" else get_read_db
@@ -0,0 +1,217 @@
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+
+slow_query_logger = logging.getLogger("app.slow_query")
+
+
+class RequestTimings:
+    """Where one request spent its time; shared with threadpool and greenlet work via a contextvar"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        # Named phases such as auth, count and serialize
+        self.phases: Dict[str, float] = {}
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def start_request() -> Tuple[RequestTimings, object]:
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def end_request(token) -> None:
+    _current.reset(token)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+@contextmanager
+def timed(phase: str):
+    """Add the duration of the block to a phase of the current request (no-op outside requests)"""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add_phase(phase, time.perf_counter() - start)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    timings = _current.get()
+    if timings is not None:
+        timings.db_queries += 1
+        timings.db_seconds += elapsed
+    if settings.SLOW_QUERY_MS and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        slow_query_logger.warning(
+            "Slow query (%.1f ms): %s | parameters: %.1000r", elapsed * 1000, statement, parameters
+        )
+
+
+_hooks_installed = False
+
+
+def install_query_hooks() -> None:
+    """Time every statement on every engine, sync or async (async engines run on a sync Engine)"""
+    global _hooks_installed
+    if not _hooks_installed:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _hooks_installed = True
+
+
+class Histogram:
+    """Prometheus-style cumulative histogram, one series per label tuple"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: Dict[tuple, List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # per-bucket counts (last slot is +Inf), sum, count
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(labels, (list(counts), total, count)) for labels, (counts, total, count) in self._series.items()]
+        for labels, (counts, total, count) in sorted(items):
+            label_text = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{{label_text},le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {total}")
+            lines.append(f"{self.name}_count{{{label_text}}} {count}")
+        return lines
+
+
+class Counter:
+    """Prometheus-style counter, one series per label tuple"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._series: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple, amount: float = 1) -> None:
+        with self._lock:
+            self._series[labels] = self._series.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._series.items())
+        for labels, total in items:
+            label_text = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels))
+            lines.append(f"{self.name}{{{label_text}}} {total}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_SECONDS = Histogram(
+    "blogi_http_request_duration_seconds", "Time to produce the response, by route",
+    ("method", "route", "status"), (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+REQUEST_DB_QUERIES = Histogram(
+    "blogi_http_request_db_queries", "SQL statements executed per request, by route",
+    ("method", "route"), (0, 1, 2, 3, 5, 8, 13, 21, 50)
+)
+REQUEST_DB_SECONDS = Histogram(
+    "blogi_http_request_db_seconds", "Time spent in SQL statements per request, by route",
+    ("method", "route"), (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+REQUEST_SERIALIZE_SECONDS = Histogram(
+    "blogi_http_request_serialize_seconds", "Time spent serializing response bodies per request, by route",
+    ("method", "route"), (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05)
+)
+HISTOGRAMS = (REQUEST_SECONDS, REQUEST_DB_QUERIES, REQUEST_DB_SECONDS, REQUEST_SERIALIZE_SECONDS)
+REQUESTS_REJECTED = Counter(
+    "blogi_http_requests_rejected_total", "Requests turned away by admission control, by reason (rate_limited, overloaded)",
+    ("reason",)
+)
+
+
+def observe_request(method: str, route: str, status_code: int, timings: RequestTimings, elapsed: float) -> None:
+    REQUEST_SECONDS.observe((method, route, str(status_code)), elapsed)
+    REQUEST_DB_QUERIES.observe((method, route), timings.db_queries)
+    REQUEST_DB_SECONDS.observe((method, route), timings.db_seconds)
+    if "serialize" in timings.phases:
+        REQUEST_SERIALIZE_SECONDS.observe((method, route), timings.phases["serialize"])
+
+
+def server_timing_header(timings: RequestTimings) -> str:
+    """Server-Timing value: total, database and named phases, in milliseconds"""
+    entries = [
+        f"app;dur={timings.elapsed * 1000:.2f}",
+        f'db;dur={timings.db_seconds * 1000:.2f};desc="{timings.db_queries} queries"',
+    ]
+    entries.extend(f"{name};dur={seconds * 1000:.2f}" for name, seconds in timings.phases.items())
+    return ", ".join(entries)
+
+
+def render_prometheus(pools: List[dict]) -> str:
+    """Request histograms plus connection pool gauges in the Prometheus text format"""
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    lines.extend(REQUESTS_REJECTED.render())
+    gauges = (
+        ("checked_out", "gauge", "Connections currently in use"),
+        ("overflow", "gauge", "Overflow connections currently open"),
+        ("max_connections", "gauge", "Upper bound of connections this worker can open"),
+        ("checkouts_total", "counter", "Connections handed out since start"),
+        ("checkout_timeouts_total", "counter", "Checkouts that gave up after DB_POOL_TIMEOUT"),
+        ("wait_seconds_total", "counter", "Total time spent obtaining connections"),
+    )
+    for field, kind, help_text in gauges:
+        name = f"blogi_db_pool_{field}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(f'{name}{{pool="{_escape(pool["name"])}"}} {pool[field]}' for pool in pools)
+    return "\n".join(lines) + "\n"
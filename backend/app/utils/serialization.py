@@ -0,0 +1,53 @@
+import json
+from typing import Type
+from pydantic import BaseModel
+from app.config import settings
+from app.schemas.post import PostList, PostResponse, PostSummary
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to pydantic serialization
+    orjson = None
+
+# Field order of each schema, so the fast path emits keys exactly as pydantic would
+_FIELDS = {model: tuple(model.model_fields) for model in (PostList, PostResponse, PostSummary)}
+
+
+def _ordered(model: Type[BaseModel], data: dict) -> dict:
+    return {field: data.get(field) for field in _FIELDS[model]}
+
+
+def _post_list(data: dict) -> dict:
+    body = _ordered(PostList, data)
+    # Items carry either the full content (PostResponse) or an excerpt (PostSummary)
+    body["items"] = [_ordered(PostResponse if "content" in item else PostSummary, item) for item in data["items"]]
+    return body
+
+
+def use_fast_path() -> bool:
+    return settings.SERIALIZER == "orjson" and orjson is not None
+
+
+def encode_trusted(model: Type[BaseModel], data: dict) -> bytes:
+    """orjson encoding of service output in the schema's field order, without validation"""
+    body = _post_list(data) if model is PostList else _ordered(model, data)
+    return orjson.dumps(body, option=orjson.OPT_UTC_Z)
+
+
+def dump_json(model: Type[BaseModel], data: dict) -> bytes:
+    """Serialize service output for a PostList or PostResponse body.
+
+    With SERIALIZER=orjson, dicts built by the service layer from database rows
+    are trusted: they are encoded straight to JSON without being validated into
+    pydantic models, byte-for-byte the same as `model_dump_json()`.
+    """
+    if not use_fast_path() or model not in _FIELDS:
+        return model.model_validate(data).model_dump_json().encode()
+    return encode_trusted(model, data)
+
+
+def dump_plain(data: dict) -> bytes:
+    """JSON for a plain dict of JSON-compatible values and datetimes"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_UTC_Z)
+    return json.dumps(data, default=lambda value: value.isoformat(), ensure_ascii=False).encode()
@@ -0,0 +1,4 @@
+"""Benchmarks for the Blogi API. Run from the backend directory, e.g.
+
+    python -m benchmarks.password_hashing --workers 0 1 2 4
+"""
@@ -0,0 +1,69 @@
+"""Minimal in-process ASGI client: drives the app without sockets or extra dependencies."""
+import asyncio
+import json
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+class ASGIClient:
+
+    def __init__(self, app):
+        self.app = app
+        # Body messages the last response was sent in; more than one means it was streamed
+        self.body_messages = 0
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        json_body=None,
+        body: bytes = b""
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """Send one HTTP request through the app; returns (status, headers, body)"""
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            headers = {"content-type": "application/json", **(headers or {})}
+        parts = urlsplit(url)
+        raw_headers = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+        raw_headers.append((b"content-length", str(len(body)).encode()))
+        raw_headers.append((b"host", b"benchmark"))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": parts.path,
+            "raw_path": parts.path.encode(),
+            "query_string": parts.query.encode(),
+            "root_path": "",
+            "headers": raw_headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("benchmark", 80),
+        }
+
+        sent = False
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Stay connected like a real client; streaming responses watch for a disconnect
+            await asyncio.Event().wait()
+
+        response = {"status": 0, "headers": {}, "body": bytearray()}
+        self.body_messages = 0
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = {name.decode().lower(): value.decode() for name, value in message.get("headers", [])}
+            elif message["type"] == "http.response.body":
+                response["body"] += message.get("body", b"")
+                if message.get("body"):
+                    self.body_messages += 1
+
+        await self.app(scope, receive, send)
+        return response["status"], response["headers"], bytes(response["body"])
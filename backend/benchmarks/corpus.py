@@ -0,0 +1,82 @@
+"""Deterministic synthetic corpus for the API benchmarks: users and posts of realistic size."""
+import random
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models.post import Post
+from app.models.user import User
+from app.services.post import make_excerpt
+from app.services.user import repair_post_counters
+from app.utils.hashing import hash_password
+
+PASSWORD = "benchmark-password"
+
+# Word frequencies follow a Zipf-like curve, so search terms range from
+# near-universal (the first words) to rare (the last ones)
+VOCABULARY = (
+    "the of and to in is for that with on as it be are this by from at or an was have not but "
+    "they which you one all were can there been has more if their when will would who so about "
+    "out up what some into them time only other new like could then these two may first any "
+    "system data performance database query index cache server request response latency "
+    "throughput memory storage network python fastapi postgres sqlite pagination cursor "
+    "search ranking excerpt thumbnail upload stream worker pool connection transaction "
+    "migration schema replica benchmark profile trace histogram percentile budget regression "
+    "release deploy container kubernetes nginx proxy compression serialization json orjson "
+    "bcrypt token session cookie header etag invalidation generation counter feed export "
+    "changes tombstone lag batch chunk buffer backpressure concurrency limiter bucket"
+).split()
+WEIGHTS = [1 / rank for rank in range(1, len(VOCABULARY) + 1)]
+
+# A term in roughly a fifth of the posts, used by the search scenario
+SEARCH_TERM = "benchmark"
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(VOCABULARY, WEIGHTS, k=rng.randint(8, 20))
+    return " ".join(words).capitalize() + "."
+
+
+def make_content(rng: random.Random, words: int) -> str:
+    """Plain-text paragraphs of about `words` words"""
+    paragraphs, count = [], 0
+    while count < words:
+        sentences = [_sentence(rng) for _ in range(rng.randint(3, 6))]
+        paragraphs.append(" ".join(sentences))
+        count += sum(len(sentence.split()) for sentence in sentences)
+    return "\n\n".join(paragraphs)
+
+
+def seed(db: Session, users: int, posts: int, content_words: int, seed_value: int = 42, chunk_size: int = 1000) -> dict:
+    """Insert `users` authors and `posts` posts spread over the last year; returns what scenarios need"""
+    rng = random.Random(seed_value)
+    hashed = hash_password(PASSWORD)  # one bcrypt hash shared by every user keeps seeding fast
+    usernames = [f"bench_user_{index}" for index in range(users)]
+    user_ids = db.execute(
+        insert(User).returning(User.id, sort_by_parameter_order=True),
+        [{"username": name, "email": f"{name}@example.com", "hashed_password": hashed} for name in usernames]
+    ).scalars().all()
+    db.commit()
+
+    now = datetime.now(timezone.utc)
+    span = timedelta(days=365).total_seconds()
+    rows = []
+    for index in range(posts):
+        content = make_content(rng, max(1, int(rng.gauss(content_words, content_words / 4))))
+        rows.append({
+            "title": " ".join(rng.choices(VOCABULARY[40:], k=rng.randint(3, 8))).capitalize()[:100],
+            "content": content,
+            "excerpt": make_excerpt(content),
+            "user_id": rng.choice(user_ids),
+            "created_at": now - timedelta(seconds=span * (posts - index) / posts),
+        })
+        if len(rows) >= chunk_size:
+            db.execute(insert(Post), rows)
+            db.commit()
+            rows = []
+    if rows:
+        db.execute(insert(Post), rows)
+        db.commit()
+    # Posts went in with plain INSERTs, so build the author counters in one pass
+    repair_post_counters(db)
+
+    return {"usernames": usernames, "user_ids": list(user_ids), "password": PASSWORD}
@@ -0,0 +1,112 @@
+"""Cold import time of the application, checked against a budget.
+
+Each run imports `app.main` in a fresh interpreter (no database or S3 needed)
+and records the wall time. The framework (FastAPI, SQLAlchemy, pydantic) is
+imported and timed first, so the app's own share is reported separately. A
+first, unmeasured run compiles the bytecode, as a worker's first start would;
+one extra run under `-X importtime` gives the breakdown, whose overhead stays
+out of the timings. The script exits non-zero when the median total or app
+share exceeds its budget, or when a module that should load lazily (boto3,
+Pillow, redis, ...) was imported eagerly, so it can gate CI. The total budget
+is the one-second cold start a worker is allowed; the framework's part of it
+depends on the machine.
+
+    python -m benchmarks.import_time --runs 5 --budget-ms 1000 --app-budget-ms 300
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Only needed once a request actually uses them
+LAZY_MODULES = ("boto3", "botocore", "PIL", "redis", "asyncpg", "aiosqlite", "psycopg2", "jose", "passlib")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import fastapi, pydantic, sqlalchemy.orm
+framework = time.perf_counter() - start
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "framework_seconds": framework, "eager": [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+
+def _top_imports(stderr: str, limit: int) -> list:
+    """Slowest imports made by app.main itself (framework already loaded), by cumulative time"""
+    # importtime lists children before their parent, indented by depth
+    children, app_children = [], []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not cumulative_us.strip().isdigit():
+            continue  # header line
+        depth = len(name) - len(name.lstrip())
+        if depth == 3:
+            children.append((name.strip(), int(cumulative_us)))
+        elif depth == 1:
+            if name.strip() == "app.main":
+                app_children = children
+            children = []
+    slowest = sorted(app_children, key=lambda item: -item[1])[:limit]
+    return [{"module": name, "ms": round(us / 1000, 2)} for name, us in slowest]
+
+
+def run_once(env: dict, importtime: bool = False) -> dict:
+    completed = subprocess.run(
+        [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", _PROBE.format(lazy=LAZY_MODULES)],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["stderr"] = completed.stderr
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time")
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="Fail when the median total import takes longer")
+    parser.add_argument("--app-budget-ms", type=float, default=300.0, help="Fail when the app's own share takes longer")
+    parser.add_argument("--top", type=int, default=10, help="Slowest app imports to report")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    run_once(env)
+    runs = [run_once(env) for _ in range(args.runs)]
+    profiled = run_once(env, importtime=True)
+    median_ms = statistics.median(run["seconds"] for run in runs) * 1000
+    app_ms = statistics.median(run["seconds"] - run["framework_seconds"] for run in runs) * 1000
+    eager = sorted({module for run in runs for module in run["eager"]})
+
+    results = {
+        "benchmark": "import_time",
+        "runs": args.runs,
+        "median_ms": round(median_ms, 2),
+        "max_ms": round(max(run["seconds"] for run in runs) * 1000, 2),
+        "budget_ms": args.budget_ms,
+        "app_median_ms": round(app_ms, 2),
+        "app_budget_ms": args.app_budget_ms,
+        "eager_lazy_modules": eager,
+        "slowest_app_imports": _top_imports(profiled["stderr"], args.top),
+        "ok": median_ms <= args.budget_ms and app_ms <= args.app_budget_ms and not eager,
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+    return 0 if results["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""Login throughput against hashing pool size.
+
+For each pool size this fires `--logins` concurrent password verifications
+through the same path /api/auth/login uses, and reports verifications per
+second, latency percentiles, 429 rejections, and how late a 10 ms event-loop
+ticker ran (the starvation every other request in the worker would see).
+
+    python -m benchmarks.password_hashing --workers 0 1 2 4 --logins 64 --rounds 12
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def _ticker(stop: asyncio.Event, lags: list, interval: float = 0.01):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def run_case(workers: int, logins: int, max_pending: int) -> dict:
+    from fastapi import HTTPException
+    from app.utils.hashing import HashingPool, check_password, hash_password
+
+    hashed = hash_password("benchmark-password")
+    pool = HashingPool(workers=workers, max_pending=max_pending)
+    # Warm every worker so process start-up is not counted
+    await asyncio.gather(*(pool.run(check_password, "benchmark-password", hashed) for _ in range(max(workers, 1))))
+
+    latencies, rejected = [], 0
+
+    async def login():
+        nonlocal rejected
+        start = time.perf_counter()
+        try:
+            await pool.run(check_password, "benchmark-password", hashed)
+        except HTTPException:
+            rejected += 1
+            return
+        latencies.append(time.perf_counter() - start)
+
+    stop, lags = asyncio.Event(), []
+    ticker = asyncio.create_task(_ticker(stop, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+    pool.shutdown()
+
+    return {
+        "workers": workers,
+        "logins": logins,
+        "completed": len(latencies),
+        "rejected_429": rejected,
+        "seconds": round(elapsed, 4),
+        "logins_per_second": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "mean": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+        },
+        "event_loop_lag_ms_max": round(max(lags, default=0.0) * 1000, 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4], help="Pool sizes to compare (0 = threadpool)")
+    parser.add_argument("--logins", type=int, default=64, help="Concurrent logins per case")
+    parser.add_argument("--max-pending", type=int, default=None, help="Queue bound; defaults to --logins (no 429s)")
+    parser.add_argument("--rounds", type=int, default=None, help="bcrypt cost factor (BCRYPT_ROUNDS)")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    # Settings are read at import time, so the cost factor has to be set first
+    if args.rounds is not None:
+        os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    from app.config import settings
+
+    results = {
+        "benchmark": "password_hashing",
+        "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+        "cpu_count": os.cpu_count(),
+        "cases": [
+            asyncio.run(run_case(workers, args.logins, args.max_pending or args.logins))
+            for workers in args.workers
+        ],
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""PostList encoding: pydantic validate-and-dump against the orjson fast path.
+
+Builds listing pages the way the service layer does (summary and full
+items, naive and aware timestamps, srcsets on some posts), checks that both
+encoders produce identical bytes, and reports the time per page.
+
+    python -m benchmarks.serialization --size 100 --iterations 500
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+
+def make_page(size: int, full: bool, rng: random.Random) -> dict:
+    from app.schemas.post import CountMode
+    from benchmarks.corpus import make_content
+
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    items = []
+    for index in range(size):
+        created = base + timedelta(seconds=rng.randint(0, 10 ** 7), microseconds=rng.choice([0, rng.randint(1, 999999)]))
+        if index % 3 == 0:
+            created = created.replace(tzinfo=None)  # SQLite hands back naive datetimes
+        content = make_content(rng, 600 if full else 40)
+        item = {
+            "id": index + 1,
+            "title": f"Post {index} – “quoted” title",
+            "image_url": f"https://example.com/uploads/{index}.jpg" if index % 2 else None,
+            "image_srcset": {"image/webp": f"https://example.com/d/{index}/thumbnail.webp 320w"} if index % 4 == 1 else None,
+            "user_id": rng.randint(1, 50),
+            "created_at": created,
+            "updated_at": created,
+            "author_username": f"author_{index % 50}",
+        }
+        item["content" if full else "excerpt"] = content
+        items.append(item)
+    return {
+        "items": items,
+        "total": 12345,
+        "page": 1,
+        "size": size,
+        "pages": 1235,
+        "next_cursor": "eyJjIjoiMjAyNi0wMS0wMVQwMDowMDowMCIsImkiOjF9",
+        "count_mode": CountMode.EXACT,
+    }
+
+
+def time_encoder(encode, page: dict, iterations: int) -> list:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        encode(page)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100, help="Items per page")
+    parser.add_argument("--iterations", type=int, default=500, help="Encodings timed per case")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    from app.schemas.post import PostList
+    from app.utils.serialization import encode_trusted
+
+    def pydantic_encode(page):
+        return PostList.model_validate(page).model_dump_json().encode()
+
+    def orjson_encode(page):
+        return encode_trusted(PostList, page)
+
+    rng = random.Random(3)
+    cases = []
+    for fields in ("summary", "full"):
+        page = make_page(args.size, fields == "full", rng)
+        identical = pydantic_encode(page) == orjson_encode(page)
+        timings = {}
+        for name, encode in (("pydantic", pydantic_encode), ("orjson", orjson_encode)):
+            samples = time_encoder(encode, page, args.iterations)
+            timings[name] = {
+                "median_us": round(statistics.median(samples) * 10 ** 6, 1),
+                "mean_us": round(statistics.fmean(samples) * 10 ** 6, 1),
+            }
+        cases.append({
+            "fields": fields,
+            "size": args.size,
+            "bytes": len(orjson_encode(page)),
+            "identical": identical,
+            "speedup": round(timings["pydantic"]["median_us"] / timings["orjson"]["median_us"], 2),
+            **timings,
+        })
+
+    results = {"benchmark": "serialization", "iterations": args.iterations, "cases": cases}
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+    return 0 if all(case["identical"] for case in cases) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
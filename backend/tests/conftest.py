@@ -0,0 +1,76 @@
+"""Shared setup for the API tests: one throwaway SQLite database, seeded once, and an in-process client.
+
+Settings are read at import time, so the environment is configured here,
+before anything imports the app. Tests share the database, as requests to
+one server would, and assert on the posts they create themselves. Run the
+suite again with DB_MODE=async for the AsyncSession path.
+
+    python -m pytest
+    DB_MODE=async python -m pytest
+"""
+import argparse
+import json
+import os
+import tempfile
+
+import pytest
+
+DATABASE_DIR = tempfile.mkdtemp(prefix="blogi-tests-")
+
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(DATABASE_DIR, 'primary.db')}?check_same_thread=false",
+    "DATABASE_REPLICA_URLS": "",
+    "RESPONSE_CACHE_BACKEND": "none",
+    "RATE_LIMIT_BACKEND": "none",
+    "IMAGE_WORKERS": "0",
+    "BCRYPT_ROUNDS": "4",
+    "PASSWORD_HASH_WORKERS": "0",
+    # The query budget reads statement counts from Server-Timing
+    "SERVER_TIMING": "true",
+    "CHANGES_SAFETY_LAG_SECONDS": "1",
+    # Several export batches per request
+    "EXPORT_BATCH_SIZE": "50",
+})
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def corpus() -> dict:
+    """Migrate and seed the database once per run; returns benchmarks.api's fixtures"""
+    from benchmarks.api import prepare_database
+
+    # Enough text that a full export outgrows one streamed chunk
+    return prepare_database(argparse.Namespace(users=3, posts=400, content_words=60, page_size=10, reuse=False))
+
+
+@pytest.fixture
+async def client(corpus):
+    """An ASGIClient on the app, inside its lifespan"""
+    from app.main import app
+    from benchmarks.asgi import ASGIClient
+
+    async with app.router.lifespan_context(app):
+        yield ASGIClient(app)
+
+
+@pytest.fixture
+async def auth_headers(client, corpus) -> dict:
+    """Bearer headers for the corpus's first author"""
+    credentials = {"username": corpus["username"], "password": corpus["password"]}
+    status_code, _, body = await client.request("POST", "/api/auth/login", json_body=credentials)
+    assert status_code == 200, body
+    return {"authorization": f"Bearer {json.loads(body)['access_token']}"}
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    """Serve the test with a fresh in-memory response cache instead of none"""
+    from app.services import response_cache
+
+    cache = response_cache.MemoryCacheBackend(max_entries=1000, ttl=60)
+    monkeypatch.setattr(response_cache, "_backend", cache)
+    return cache
@@ -0,0 +1,91 @@
+"""Rate limiting and load shedding end to end, with small limits so they trip quickly.
+
+Requests carry X-Forwarded-For as nginx would send it.
+"""
+import asyncio
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+IP_BURST = 10
+USER_BURST = 20
+CONCURRENCY = 2
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    from app.config import settings
+    from app.services import rate_limit
+
+    for name, value in {
+        "RATE_LIMIT_BACKEND": "memory",
+        "RATE_LIMIT_IP_RATE": 0.01,
+        "RATE_LIMIT_IP_BURST": IP_BURST,
+        "RATE_LIMIT_USER_RATE": 0.01,
+        "RATE_LIMIT_USER_BURST": USER_BURST,
+        "TRUSTED_PROXY_HOPS": 1,
+        "MAX_CONCURRENT_REQUESTS": CONCURRENCY,
+        "ADMISSION_WAIT_SECONDS": 0.05,
+    }.items():
+        monkeypatch.setattr(settings, name, value)
+    monkeypatch.setattr(rate_limit, "_backend", None)
+
+
+def from_ip(address, **headers):
+    # The first entry is client-supplied and must be ignored; nginx appends the real address
+    return {"x-forwarded-for": f"192.0.2.1, {address}", **headers}
+
+
+async def test_anonymous_clients_are_limited_per_address(client, limits):
+    statuses = [(await client.request("GET", "/api/blogs/", from_ip("10.0.0.1")))[0] for _ in range(IP_BURST)]
+    assert statuses == [200] * IP_BURST
+    status_code, headers, _ = await client.request("GET", "/api/blogs/", from_ip("10.0.0.1"))
+    assert status_code == 429
+    assert "retry-after" in headers
+
+    status_code, _, _ = await client.request("GET", "/api/blogs/", from_ip("10.0.0.3"))
+    assert status_code == 200
+
+
+async def test_searches_and_logins_cost_more(client, corpus, limits):
+    statuses = [(await client.request("GET", "/api/blogs/?search=benchmark", from_ip("10.0.0.4")))[0] for _ in range(3)]
+    assert statuses == [200, 200, 429]
+
+    credentials = {"username": corpus["username"], "password": corpus["password"]}
+    status_code, _, _ = await client.request("POST", "/api/auth/login", from_ip("10.0.0.5"), credentials)
+    assert status_code == 200
+    status_code, _, _ = await client.request("POST", "/api/auth/login", from_ip("10.0.0.5"), credentials)
+    assert status_code == 429
+
+
+async def test_signed_in_users_are_limited_per_user(client, auth_headers, limits):
+    authorized = from_ip("10.0.0.1", **auth_headers)
+    statuses = [(await client.request("GET", "/api/blogs/", authorized))[0] for _ in range(USER_BURST + 1)]
+    assert statuses == [200] * USER_BURST + [429]
+
+    forged = from_ip("10.0.0.6", authorization="Bearer not-a-token")
+    statuses = [(await client.request("GET", "/api/blogs/", forged))[0] for _ in range(IP_BURST + 1)]
+    assert statuses[-1] == 429
+
+
+async def test_metrics_are_never_limited(client, limits):
+    for _ in range(IP_BURST + 1):
+        status_code, _, _ = await client.request("GET", "/metrics", from_ip("10.0.0.7"))
+        assert status_code == 200
+
+
+async def test_requests_over_the_concurrency_cap_are_shed(limits):
+    from app.middleware.admission import ConcurrencyLimitMiddleware
+    from benchmarks.asgi import ASGIClient
+
+    async def slow_app(scope, receive, send):
+        await asyncio.sleep(0.3)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    limited = ASGIClient(ConcurrencyLimitMiddleware(slow_app))
+    results = await asyncio.gather(*(limited.request("GET", "/api/blogs/") for _ in range(CONCURRENCY + 2)))
+
+    assert sorted(status_code for status_code, _, _ in results) == [200] * CONCURRENCY + [503] * 2
+    assert all("retry-after" in headers for status_code, headers, _ in results if status_code == 503)
@@ -0,0 +1,120 @@
+"""The change feed: a client syncing through GET /api/blogs/changes ends up with every post.
+
+The seeded posts share a handful of timestamps, so batch boundaries fall
+between rows with equal updated_at. conftest sets the safety lag to a second.
+"""
+import asyncio
+import json
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+# Sleep past CHANGES_SAFETY_LAG_SECONDS and the one-second timestamp resolution
+PAST_THE_LAG = 2.1
+
+
+async def sync(client, headers, mirror, since=None, limit=7):
+    """Apply batches until the feed is drained; returns the final token and the items seen"""
+    seen = []
+    while True:
+        url = f"/api/blogs/changes?limit={limit}" + (f"&since={since}" if since else "")
+        status_code, _, body = await client.request("GET", url, headers)
+        assert status_code == 200, body
+        batch = json.loads(body)
+        for item in batch["items"]:
+            seen.append(item)
+            if item["deleted"]:
+                mirror.pop(item["id"], None)
+            else:
+                mirror[item["id"]] = item["post"]
+        since = batch["next"]
+        if not batch["has_more"]:
+            return since, seen
+
+
+async def database_posts(client, headers):
+    posts, cursor = {}, None
+    while True:
+        url = "/api/blogs/?size=100&count=none&fields=full" + (f"&cursor={cursor}" if cursor else "")
+        _, _, body = await client.request("GET", url, headers)
+        page = json.loads(body)
+        posts.update((post["id"], post) for post in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return posts
+
+
+def assert_same(mirror, posts):
+    assert mirror.keys() == posts.keys()
+    for post_id, post in posts.items():
+        for field in ("title", "content", "image_url", "updated_at"):
+            assert mirror[post_id][field] == post[field], (post_id, field)
+
+
+async def test_bad_requests_are_rejected(client, auth_headers):
+    status_code, _, _ = await client.request("GET", "/api/blogs/changes")
+    assert status_code == 401
+    status_code, _, _ = await client.request("GET", "/api/blogs/changes?since=not-a-token", auth_headers)
+    assert status_code == 400
+
+
+async def test_syncing_mirrors_the_posts_and_then_only_their_changes(client, auth_headers):
+    # Let everything written so far fall behind the safety lag
+    await asyncio.sleep(PAST_THE_LAG)
+    mirror = {}
+    token, seen = await sync(client, auth_headers, mirror)
+    posts = await database_posts(client, auth_headers)
+    assert_same(mirror, posts)
+    assert len(seen) == len(posts)
+
+    token, seen = await sync(client, auth_headers, mirror, token)
+    assert not seen
+
+    created = []
+    for number in range(3):
+        _, _, body = await client.request(
+            "POST", "/api/blogs/", auth_headers, {"title": f"Synced post {number}", "content": "Made after the first sync."}
+        )
+        created.append(json.loads(body))
+    # Posts of this user's written before the first sync
+    author_id = created[0]["user_id"]
+    own = sorted(post_id for post_id, post in mirror.items() if post["user_id"] == author_id)
+    edited, deleted = own[0], own[1]
+    statuses = [
+        (await client.request("PUT", f"/api/blogs/{edited}", auth_headers, {"title": "Edited after the first sync"}))[0],
+        (await client.request("PUT", f"/api/blogs/{created[0]['id']}", auth_headers, {"content": "Created, then edited."}))[0],
+        (await client.request("DELETE", f"/api/blogs/{deleted}", auth_headers))[0],
+        (await client.request("DELETE", f"/api/blogs/{created[1]['id']}", auth_headers))[0],
+    ]
+    assert statuses == [200] * 4
+
+    # Held back until past the safety lag
+    _, _, body = await client.request("GET", f"/api/blogs/changes?since={token}", auth_headers)
+    assert not json.loads(body)["items"]
+
+    await asyncio.sleep(PAST_THE_LAG)
+    token, seen = await sync(client, auth_headers, mirror, token, limit=2)
+    assert sorted((item["id"], item["deleted"]) for item in seen) == sorted([
+        (created[0]["id"], False), (created[2]["id"], False), (edited, False), (deleted, True), (created[1]["id"], True)
+    ])
+    assert_same(mirror, await database_posts(client, auth_headers))
+
+    token, seen = await sync(client, auth_headers, mirror, token)
+    assert not seen
+
+
+async def test_bulk_imported_posts_reach_the_feed(client, auth_headers):
+    await asyncio.sleep(PAST_THE_LAG)
+    token, _ = await sync(client, auth_headers, {})
+
+    lines = [json.dumps({"title": f"Imported {number}", "content": "Streamed in."}) for number in range(5)]
+    status_code, _, body = await client.request(
+        "POST", "/api/blogs/bulk", {**auth_headers, "content-type": "application/x-ndjson"}, body="\n".join(lines).encode()
+    )
+    assert status_code == 200, body
+    assert json.loads(body)["inserted"] == 5
+
+    await asyncio.sleep(PAST_THE_LAG)
+    _, seen = await sync(client, auth_headers, {}, token)
+    assert sorted(item["post"]["title"] for item in seen) == sorted(f"Imported {number}" for number in range(5))
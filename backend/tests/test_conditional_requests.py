@@ -0,0 +1,33 @@
+"""ETags and 304s for posts and listings, including edits made within the same second."""
+import json
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def revalidate(client, url, headers, etag):
+    status_code, response_headers, _ = await client.request("GET", url, {**headers, "if-none-match": etag})
+    return status_code, response_headers.get("etag")
+
+
+async def test_edits_within_a_second_change_the_etags(client, auth_headers):
+    _, _, body = await client.request("POST", "/api/blogs/", auth_headers, {"title": "Revalidated", "content": "First."})
+    post = json.loads(body)
+    post_url = f"/api/blogs/{post['id']}"
+    listing_url = f"/api/blogs/user/{post['user_id']}?size=5&count=none&fields=full"
+    _, post_headers, _ = await client.request("GET", post_url, auth_headers)
+    _, listing_headers, _ = await client.request("GET", listing_url, auth_headers)
+    assert await revalidate(client, post_url, auth_headers, post_headers["etag"]) == (304, post_headers["etag"])
+
+    status_code, _, body = await client.request("PUT", post_url, auth_headers, {"content": "Second."})
+    assert status_code == 200
+    if json.loads(body)["updated_at"] != post["updated_at"]:
+        pytest.skip("the edit landed in a later second")
+
+    status_code, etag = await revalidate(client, post_url, auth_headers, post_headers["etag"])
+    assert status_code == 200
+    assert etag != post_headers["etag"]
+    status_code, etag = await revalidate(client, listing_url, auth_headers, listing_headers["etag"])
+    assert status_code == 200
+    assert etag != listing_headers["etag"]
@@ -0,0 +1,98 @@
+"""Post exports: GET /api/blogs/export in both formats, with its filters, streamed.
+
+Posts are created through the API, several per second and some with commas,
+quotes and newlines in their content, so rows share updated_at values and
+need CSV quoting.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from urllib.parse import quote
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+POSTS = 30
+AWKWARD_CONTENT = 'Commas, "quotes" and\nnewlines,\r\nall in one post.'
+
+
+def parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def ndjson_ids(body):
+    return [json.loads(line)["id"] for line in body.splitlines()]
+
+
+def csv_rows(body):
+    return list(csv.DictReader(io.StringIO(body.decode(), newline="")))
+
+
+async def export(client, headers, query=""):
+    status_code, response_headers, body = await client.request("GET", f"/api/blogs/export?{query}", headers)
+    assert status_code == 200, body
+    return response_headers, body
+
+
+@pytest.fixture
+async def created(client, auth_headers):
+    posts = []
+    for number in range(POSTS):
+        content = AWKWARD_CONTENT if number % 5 == 0 else f"Exported post number {number}."
+        _, _, body = await client.request("POST", "/api/blogs/", auth_headers, {"title": f"Exported {number}", "content": content})
+        posts.append(json.loads(body))
+    return posts
+
+
+async def test_anonymous_requests_are_rejected(client):
+    status_code, _, _ = await client.request("GET", "/api/blogs/export")
+    assert status_code == 401
+
+
+async def test_both_formats_hold_every_post_once_intact(client, auth_headers, created):
+    response_headers, body = await export(client, auth_headers)
+    assert response_headers.get("content-type") == "application/x-ndjson"
+    assert "attachment" in response_headers.get("content-disposition", "")
+    rows = {row["id"]: row for row in map(json.loads, body.splitlines())}
+    ids = list(rows)
+    assert ids == sorted(set(ids))
+    _, _, listing = await client.request("GET", "/api/blogs/?size=1", auth_headers)
+    assert len(ids) == json.loads(listing)["total"]
+    assert all(rows[post["id"]]["content"] == post["content"] for post in created)
+
+    response_headers, body = await export(client, auth_headers, "format=csv")
+    assert response_headers.get("content-type", "").startswith("text/csv")
+    table = csv_rows(body)
+    assert [int(row["id"]) for row in table] == ids
+    by_id = {int(row["id"]): row for row in table}
+    assert all(by_id[post["id"]]["content"] == post["content"] for post in created)
+
+
+async def test_author_filter(client, auth_headers, created):
+    user_id = created[0]["user_id"]
+    _, body = await export(client, auth_headers, f"author_id={user_id}")
+    authored = [json.loads(line) for line in body.splitlines()]
+    _, _, stats = await client.request("GET", f"/api/users/{user_id}", auth_headers)
+    assert authored
+    assert all(row["user_id"] == user_id for row in authored)
+    assert len(authored) == json.loads(stats)["post_count"]
+
+
+async def test_updated_since_includes_posts_edited_in_the_bound_second(client, auth_headers, created):
+    _, body = await export(client, auth_headers)
+    rows = [json.loads(line) for line in body.splitlines()]
+    # The bound is an exported row's own updated_at, shared by the posts created in the same second
+    boundary = next(row["updated_at"] for row in rows if row["id"] == created[POSTS // 2]["id"])
+    expected = sorted(row["id"] for row in rows if parse_time(row["updated_at"]) >= parse_time(boundary))
+
+    _, body = await export(client, auth_headers, f"updated_since={quote(boundary)}")
+    assert ndjson_ids(body) == expected
+    _, body = await export(client, auth_headers, f"format=csv&updated_since={quote(boundary)}")
+    assert [int(row["id"]) for row in csv_rows(body)] == expected
+
+
+async def test_large_exports_are_streamed_in_pieces(client, auth_headers):
+    await export(client, auth_headers)
+    assert client.body_messages > 1
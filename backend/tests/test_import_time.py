@@ -0,0 +1,19 @@
+"""Importing the app loads nothing it only needs per request, and adds little to the framework's own import."""
+import os
+import statistics
+
+from benchmarks.import_time import run_once
+
+RUNS = 3
+APP_BUDGET_MS = 300
+
+
+def test_app_imports_lazily_and_quickly():
+    # The one-second total includes FastAPI and friends, which vary with the
+    # machine; `python -m benchmarks.import_time` gates that where it is meaningful
+    env = dict(os.environ)
+    run_once(env)
+    runs = [run_once(env) for _ in range(RUNS)]
+
+    assert not sorted({module for run in runs for module in run["eager"]})
+    assert statistics.median(run["seconds"] - run["framework_seconds"] for run in runs) * 1000 <= APP_BUDGET_MS
@@ -0,0 +1,104 @@
+"""Cursor pagination over posts created through the API, several per second.
+
+Posts written by the API get second-resolution server timestamps, so many
+share a created_at and page boundaries fall between equal timestamps.
+"""
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+POSTS = 45
+PAGE_SIZE = 4
+
+
+async def walk(client, url, headers, limit):
+    """Items in the order the cursor pages returned them; fails when the walk does not end"""
+    items, cursor = [], None
+    for _ in range(limit):
+        status_code, _, body = await client.request("GET", url + (f"&cursor={cursor}" if cursor else ""), headers)
+        assert status_code == 200, body
+        page = json.loads(body)
+        items.extend(page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return items
+    pytest.fail(f"{url}: still paging after {limit} pages")
+
+
+@pytest.fixture
+async def created(client, auth_headers):
+    posts = []
+    for number in range(POSTS):
+        status_code, _, body = await client.request(
+            "POST", "/api/blogs/", auth_headers, {"title": f"Walked post {number}", "content": "Paged through by cursor."}
+        )
+        assert status_code == 201, body
+        posts.append(json.loads(body))
+    return posts
+
+
+@pytest.mark.parametrize("listing", [
+    # full items always come from the database; summaries from the home feed first
+    "/api/blogs/?size={size}&count=none&fields=full",
+    "/api/blogs/?size={size}&count=none",
+    "/api/blogs/user/{user_id}?size={size}&count=none",
+])
+async def test_cursor_walk_returns_every_post_once_newest_first(client, auth_headers, corpus, created, listing):
+    newest_first = [post["id"] for post in sorted(created, key=lambda post: (post["created_at"], post["id"]), reverse=True)]
+    url = listing.format(size=PAGE_SIZE, user_id=created[0]["user_id"])
+
+    ids = [item["id"] for item in await walk(client, url, auth_headers, limit=(corpus["total"] + 1000) // PAGE_SIZE)]
+
+    assert len(ids) == len(set(ids))
+    assert [post_id for post_id in ids if post_id in set(newest_first)] == newest_first
+
+
+async def test_author_listing_holds_only_that_authors_posts(client, auth_headers, corpus, created):
+    authors = set()
+    for post_id in corpus["post_ids"][:10]:
+        _, _, body = await client.request("GET", f"/api/blogs/{post_id}", auth_headers)
+        authors.add(json.loads(body)["user_id"])
+    other_id = min(authors - {created[0]["user_id"]})
+    _, _, body = await client.request("GET", f"/api/users/{other_id}", auth_headers)
+    post_count = json.loads(body)["post_count"]
+
+    _, _, body = await client.request("GET", f"/api/blogs/user/{other_id}?size=1", auth_headers)
+    assert json.loads(body)["total"] == post_count
+    items = await walk(client, f"/api/blogs/user/{other_id}?size=50&count=none&fields=full", auth_headers, limit=100)
+    assert len(items) == post_count
+    assert all(item["user_id"] == other_id for item in items)
+
+
+@pytest.mark.parametrize("offset", ["+00:00", "+05:30", ""])
+@pytest.mark.parametrize("listing", [
+    "/api/blogs/?size=3&count=none",
+    "/api/blogs/?size=3&count=none&fields=full",
+])
+async def test_cursors_with_or_without_an_offset_are_accepted(client, auth_headers, corpus, listing, offset):
+    from app.services.feed import home_feed
+    from app.services.post import encode_cursor
+
+    home_feed.mark_stale()
+    _, _, body = await client.request("GET", listing, auth_headers)
+    newest = json.loads(body)["items"][0]
+    created_at = datetime.fromisoformat(newest["created_at"].replace("Z", "+00:00"))
+    # The same instant written in the cursor's offset, or naive UTC
+    if offset:
+        hours, minutes = offset[1:].split(":")
+        created_at = created_at.astimezone(timezone(timedelta(hours=int(hours), minutes=int(minutes))))
+    else:
+        created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+
+    status_code, _, body = await client.request(
+        "GET", f"{listing}&cursor={encode_cursor(created_at, newest['id'])}", auth_headers
+    )
+    assert status_code == 200, body
+    assert newest["id"] not in [item["id"] for item in json.loads(body)["items"]]
+
+    far_future = encode_cursor(datetime(2030, 1, 1, tzinfo=timezone.utc), 0)
+    status_code, _, body = await client.request("GET", f"{listing}&cursor={far_future}", auth_headers)
+    assert status_code == 200, body
+    assert json.loads(body)["items"][0]["id"] == newest["id"]
@@ -0,0 +1,51 @@
+"""Guard against N+1 and redundant queries: SQL statements per endpoint, read from Server-Timing."""
+import json
+import re
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+# (name, method, url template, JSON body, allowed statements). Authentication,
+# the home feed and the search index are warmed up first, so their one-off loads are not counted here.
+BUDGETS = (
+    ("login", "POST", "/api/auth/login", "login", 1),
+    ("list", "GET", "/api/blogs/", None, 0),
+    ("list_uncounted", "GET", "/api/blogs/?count=none", None, 0),
+    ("list_search", "GET", "/api/blogs/?search=benchmark", None, 2),
+    ("list_full", "GET", "/api/blogs/?fields=full", None, 2),
+    ("read", "GET", "/api/blogs/{post_id}", None, 1),
+    ("create", "POST", "/api/blogs/", {"title": "Budget post", "content": "Budget content."}, 2),
+    ("update", "PUT", "/api/blogs/{new_post_id}", {"title": "Budget post, edited"}, 1),
+    ("delete", "DELETE", "/api/blogs/{new_post_id}", None, 3),
+    ("changes", "GET", "/api/blogs/changes", None, 3),
+    ("user_posts", "GET", "/api/blogs/user/{user_id}", None, 2),
+    ("user_stats", "GET", "/api/users/{user_id}", None, 1),
+)
+
+_QUERIES = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+async def test_endpoints_stay_within_their_query_budgets(client, auth_headers, corpus):
+    credentials = {"username": corpus["username"], "password": corpus["password"]}
+    values = {"post_id": corpus["post_ids"][0], "user_id": 0, "new_post_id": 0}
+    # Warm the principal cache, the home feed and the search index
+    await client.request("GET", f"/api/blogs/{values['post_id']}", auth_headers)
+    await client.request("GET", "/api/blogs/")
+    await client.request("GET", "/api/blogs/?search=warmup")
+
+    over_budget = []
+    for name, method, url, body, budget in BUDGETS:
+        status_code, headers, response_body = await client.request(
+            method, url.format(**values), auth_headers, credentials if body == "login" else body
+        )
+        if name == "create" and status_code < 400:
+            created = json.loads(response_body)
+            values["new_post_id"] = created["id"]
+            values["user_id"] = created["user_id"]
+        match = _QUERIES.search(headers.get("server-timing", ""))
+        queries = int(match.group(1)) if match else None
+        if status_code >= 400 or queries is None or queries > budget:
+            over_budget.append({"endpoint": name, "status": status_code, "queries": queries, "budget": budget})
+
+    assert not over_budget
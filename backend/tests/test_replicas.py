@@ -0,0 +1,85 @@
+"""Read-replica routing, with SQLite files standing in for a primary and its replicas.
+
+The replica is a copy of the primary holding one extra post that only it has,
+so each response shows which database served it; a second replica URL points
+at a path that cannot be opened and must be taken out of rotation.
+"""
+import json
+import shutil
+import sqlite3
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+REPLICA_MARKER = "Only on the replica"
+
+
+@pytest.fixture
+async def replicas(client, monkeypatch, tmp_path):
+    from app.config import settings
+    from app.database import get_engine
+    from app.services.feed import home_feed
+    from app.utils import replicas
+
+    primary = get_engine().url.database
+    replica = str(tmp_path / "replica.db")
+    shutil.copyfile(primary, replica)
+    with sqlite3.connect(replica) as connection:
+        connection.execute(
+            "INSERT INTO posts (title, content, excerpt, user_id, created_at, updated_at) "
+            "VALUES (?, ?, ?, 1, datetime('now'), datetime('now'))",
+            (REPLICA_MARKER, REPLICA_MARKER, REPLICA_MARKER)
+        )
+
+    replica_set = replicas.ReplicaSet([
+        f"sqlite:///{replica}?check_same_thread=false",
+        f"sqlite:///{tmp_path / 'missing' / 'replica.db'}?check_same_thread=false",
+    ], is_async=settings.DB_MODE == "async")
+    monkeypatch.setattr(replicas, "replica_set", replica_set)
+    await replica_set.check_all()
+    # Make the next summary listing reload the home feed
+    home_feed.mark_stale()
+    yield replica_set
+    await replica_set.shutdown()
+
+
+async def newest_title(client, headers=None):
+    # Full items are always read from the database, never the in-memory home feed
+    _, _, body = await client.request("GET", "/api/blogs/?size=1&count=none&fields=full", headers or {})
+    return json.loads(body)["items"][0]["title"]
+
+
+async def test_unreachable_replica_leaves_rotation(replicas):
+    healthy, missing = replicas.status()
+    assert healthy["healthy"]
+    assert not missing["healthy"]
+
+
+async def test_home_feed_loads_from_the_primary(client, replicas):
+    _, _, body = await client.request("GET", "/api/blogs/?size=1&count=none")
+    assert json.loads(body)["items"][0]["title"] != REPLICA_MARKER
+
+
+async def test_reads_go_to_the_replica_and_writers_read_their_writes(client, corpus, replicas, memory_cache):
+    from app.services.response_cache import listing_cache_key
+
+    assert [await newest_title(client) for _ in range(4)] == [REPLICA_MARKER] * 4
+
+    credentials = {"username": corpus["username"], "password": corpus["password"]}
+    _, _, body = await client.request("POST", "/api/auth/login", json_body=credentials)
+    headers = {"authorization": f"Bearer {json.loads(body)['access_token']}"}
+    assert await newest_title(client, headers) == REPLICA_MARKER
+
+    _, _, body = await client.request(
+        "POST", "/api/blogs/", headers, {"title": "Written to the primary", "content": "Read it back."}
+    )
+    created = json.loads(body)
+    # Other readers stay on the replica, and what it renders inside the lag window is not cached
+    assert await newest_title(client) == REPLICA_MARKER
+    key = await listing_cache_key(page=1, cursor=None, size=1, search=None, count="none", fields="full")
+    assert await memory_cache.get(key) is None
+
+    assert await newest_title(client, headers) == created["title"]
+    status_code, _, _ = await client.request("GET", f"/api/blogs/{created['id']}", headers)
+    assert status_code == 200
@@ -3,6 +3,8 @@ export interface Blog {
   title: string;
   image_url?: string;
   content: string;
+  excerpt?: string;
+  image_srcset?: Record<string, string> | null;
   user_id: number;
   created_at: string;
   author_username: string;